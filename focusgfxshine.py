@@ -1,5 +1,7 @@
 #!/usr/bin/python
 import argparse
+import mmap
+import os
 import re
 
 #############################
@@ -26,6 +28,56 @@ import re
 #############################
 
 
+GOAL_REGEX = re.compile(
+    r"name\s*=\s*\"([^\"]+)?\"(?:[^\}]*?)texturefile\s*=\s*\"([^\"]+)?\"", re.IGNORECASE
+)
+GOAL_NAME_REGEX = re.compile(r"name\s*=\s*\"([^\"]+)?\"", re.IGNORECASE)
+COMMENTS_REGEX = re.compile(r"#[^\n]*")
+# goals 파일은 mmap 위에서 바로 찾도록 같은 패턴의 bytes 버전을 쓴다.
+GOAL_BYTES_REGEX = re.compile(GOAL_REGEX.pattern.encode("ascii"), re.IGNORECASE)
+COMMENTS_BYTES_REGEX = re.compile(COMMENTS_REGEX.pattern.encode("ascii"))
+
+
+def strip_comments(content):
+    # 주석이 없는 파일은 사본을 만들지 않고 그대로 쓴다.
+    if "#" not in content:
+        return content
+    return COMMENTS_REGEX.sub('', content)
+
+
+def find_goals(path):
+    # 파일 전체를 문자열로 읽지 않고 mmap 위에서 (name, texturefile)을 찾는다.
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return []
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            content = mm
+            if mm.find(b"#") != -1:
+                content = COMMENTS_BYTES_REGEX.sub(b"", mm)
+            return [
+                (name.decode("utf-8"), texture.decode("utf-8"))
+                for name, texture in GOAL_BYTES_REGEX.findall(content)
+            ]
+
+
+def write_atomic(path, content):
+    # 임시 파일에 다 쓴 뒤 교체해, 쓰는 도중 실패해도 원본이 깨지지 않게 한다.
+    tmp_path = f"{path}.tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(content)
+            # 교체 전에 디스크까지 내려 두어야 OS가 죽어도 빈 파일이 남지 않는다.
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
 def get_shine_def(name, path):
     # 모드 폴더 기준 상대 경로로 변환
     rel_path = path.replace('\\', '/')
@@ -79,54 +131,37 @@ def main():
 
     args = parser.parse_args()
 
-    goal_regex = re.compile(
-        r"name\s*=\s*\"([^\"]+)?\"(?:[^\}]*?)texturefile\s*=\s*\"([^\"]+)?\"",  re.MULTILINE | re.DOTALL | re.IGNORECASE
-    )
-    goal_name_regex = re.compile(
-        r"name\s*=\s*\"([^\"]+)?\"",  re.MULTILINE | re.DOTALL | re.IGNORECASE
-    )
-    comments_regex = re.compile(
-        r"#*$"
-    )
-
     print(f"Reading {args.goals_shine}...")
-    with open(args.goals_shine, "r") as f:
+    with open(args.goals_shine, "r", encoding="utf-8") as f:
         goals_shine = f.read()
 
-    goals_shine_matches = goal_name_regex.findall(
-        comments_regex.sub(goals_shine, '')
-    )
+    goals_shine_matches = GOAL_NAME_REGEX.findall(strip_comments(goals_shine))
     goals_shine_matches = set(goals_shine_matches)
 
-    last_bracket_idx = 0
-
-    for i in range(len(goals_shine) - 1, -1, -1):
-        if goals_shine[i] == "}":
-            last_bracket_idx = abs(i)
-            break
-
-    goals_shine_split = [goals_shine[:last_bracket_idx], goals_shine[last_bracket_idx:]]
+    last_bracket_idx = max(goals_shine.rfind("}"), 0)
 
     print(f"Reading {args.goals}...")
-    with open(args.goals, "r") as f:
-        goals = f.read()
-
-    goals_matches = goal_regex.findall(
-        comments_regex.sub(goals, '')
-    )
+    goals_matches = find_goals(args.goals)
     goals_matches = {
         k: v for k, v in goals_matches if not f"{k}_shine" in goals_shine_matches
     }
 
     print(f"Found {len(goals_matches)} missing shine entries...")
 
+    shine_defs = []
     for k, v in goals_matches.items():
         print(f'"{k}" not found in "{args.goals_shine}", adding as "{k}_shine"...')
-        goals_shine_split.insert(1, get_shine_def(k, v))
+        shine_defs.append(get_shine_def(k, v))
+
+    if not shine_defs:
+        print(f"{args.goals_shine} is up to date, nothing to save.")
+        return
 
     print(f"Saving modified {args.goals_shine}...")
-    with open(args.goals_shine, "w") as f:
-        f.write("\n".join(goals_shine_split))
+    write_atomic(
+        args.goals_shine,
+        "\n".join([goals_shine[:last_bracket_idx], *shine_defs, goals_shine[last_bracket_idx:]]),
+    )
 
 
 if __name__ == "__main__":
@@ -6,73 +6,58 @@
 
 import os
 import re
+from bisect import bisect_right
+from itertools import accumulate
 from pathlib import Path
 
 from PyQt6.QtCore import QThread, pyqtSignal
 
-_FILE_EXTENSIONS = ("*.txt", "*.gui", "*.mod", "*.pdx", "*.interface",
-                    "*.gfx", "*.lua", "*.yml", "*.yaml")
-
-_GFX_PATTERNS = [
-    r'icon\s*=\s*(["\']?)([A-Za-z0-9_]+)\1',
-    r'texture\s*=\s*(["\']?)([A-Za-z0-9_]+)\1',
-    r'spriteType\s*=\s*(["\']?)([A-Za-z0-9_]+)\1',
-    r'texturefile\s*=\s*(["\']?)([A-Za-z0-9_./\\]+)\1',
-    r'sprite\s*=\s*(["\']?)([A-Za-z0-9_]+)\1',
-    r'frame\s*=\s*(["\']?)([A-Za-z0-9_]+)\1',
-    r'buttonType\s*=\s*\{[^}]*?quadTextureSprite\s*=\s*(["\']?)([A-Za-z0-9_]+)\1',
-    r'iconType\s*=\s*\{[^}]*?spriteType\s*=\s*(["\']?)([A-Za-z0-9_]+)\1',
-    r'instantTextBoxType\s*=\s*\{[^}]*?font\s*=\s*(["\']?)([A-Za-z0-9_]+)\1',
-    r'GFX_[A-Za-z0-9_]+',
-    r'"(GFX_[^"]+)"',
-    r"'(GFX_[^']+)'",
-    r'@\[?([A-Za-z0-9_]*GFX[A-Za-z0-9_]*)\]?',
-    r'\$([A-Za-z0-9_]*GFX[A-Za-z0-9_]*)\$',
-    r'@sprite\s*=\s*([A-Za-z0-9_]+)',
-    r'@texture\s*=\s*([A-Za-z0-9_]+)',
-    r'effectFile\s*=\s*(["\']?)([A-Za-z0-9_./\\]+)\1',
-    r'animationmaskfile\s*=\s*(["\']?)([A-Za-z0-9_./\\]+)\1',
-    r'animationtexturefile\s*=\s*(["\']?)([A-Za-z0-9_./\\]+)\1',
-    r'GetSprite\s*\(\s*["\']([^"\'")]+)["\']\s*\)',
-    r'SetSprite\s*\(\s*["\']([^"\'")]+)["\']\s*\)',
-    r'background\s*=\s*(["\']?)([A-Za-z0-9_]+)\1',
-    r'highlight\s*=\s*(["\']?)([A-Za-z0-9_]+)\1',
-    r'glow\s*=\s*(["\']?)([A-Za-z0-9_]+)\1',
-]
-
-_COMPILED_PATTERNS = [
-    re.compile(p, re.IGNORECASE | re.MULTILINE | re.DOTALL) for p in _GFX_PATTERNS
-]
-
-
-def _strip_line_comments(content: str) -> str:
-    """라인별로 `#` 주석 제거. 문자열 내부의 `#`은 유지."""
-    cleaned_lines = []
-    for line in content.split("\n"):
-        in_string = False
-        quote_char = None
-        out = []
-        pos = 0
-        while pos < len(line):
-            char = line[pos]
-            if not in_string and char == "#":
-                break
-            if char in ('"', "'") and (pos == 0 or line[pos - 1] != "\\"):
-                if not in_string:
-                    in_string = True
-                    quote_char = char
-                elif char == quote_char:
-                    in_string = False
-                    quote_char = None
-            out.append(char)
-            pos += 1
-        cleaned_lines.append("".join(out))
-    return "\n".join(cleaned_lines)
-
-
-def _iter_code_files(mod_folder_path):
-    for ext in _FILE_EXTENSIONS:
-        yield from Path(mod_folder_path).rglob(ext)
+from .code_scan import scan_code_files
+
+# GFX 참조를 찾는 코드 파일 확장자. 분석 리포트도 이 목록을 그대로 보여준다.
+CODE_FILE_SUFFIXES = (".txt", ".gui", ".mod", ".pdx", ".interface",
+                      ".gfx", ".lua", ".yml", ".yaml")
+
+
+def _gfx_base(name):
+    return name.replace("GFX_", "") if name.startswith("GFX_") else name
+
+
+def _related_used_finder(used_gfx):
+    """미사용 후보 이름과 관련된 사용 중 GFX를 찾는 함수를 만든다.
+
+    베이스 이름 일치, 또는 어느 한쪽이 다른 쪽의 부분 문자열이면 관련된 것으로 본다.
+    후보마다 사용 GFX 전체를 순회하지 않도록 사전, 이어 붙인 문자열 검색,
+    리터럴 alternation 정규식을 미리 만든다. 찾지 못하면 None을 돌려준다.
+    """
+    used_names = sorted(used_gfx)
+    by_base = {}
+    for used in used_names:
+        by_base.setdefault(_gfx_base(used), used)
+    # 스프라이트 이름에는 공백이 없으므로 개행으로 이어 붙여도 이름 경계를 넘는 매치가 없다.
+    joined = "\n".join(used_names)
+    starts = list(accumulate((len(used) + 1 for used in used_names[:-1]), initial=0))
+    contained = re.compile("|".join(map(re.escape, used_names))) if used_names else None
+
+    def find(gfx_name):
+        used = by_base.get(_gfx_base(gfx_name))
+        if used is not None:
+            return used
+        pos = joined.find(gfx_name)
+        if pos >= 0:
+            return used_names[bisect_right(starts, pos) - 1]
+        match = contained.search(gfx_name) if contained else None
+        return match.group() if match else None
+
+    return find
+
+
+def iter_code_files(mod_folder_path):
+    """모드 폴더 아래에서 CODE_FILE_SUFFIXES에 해당하는 파일 경로를 내놓는다."""
+    for root, _, files in os.walk(mod_folder_path):
+        for file_name in files:
+            if file_name.lower().endswith(CODE_FILE_SUFFIXES):
+                yield Path(root, file_name)
 
 
 def analyze_mod_folder(mod_folder_path, gfx_data, progress_callback=None):
@@ -104,79 +89,34 @@ def analyze_mod_folder(mod_folder_path, gfx_data, progress_callback=None):
 
     emit(30)
 
-    code_files = list(_iter_code_files(mod_folder_path))
+    code_files = list(iter_code_files(mod_folder_path))
     total_files = max(len(code_files), 1)
 
-    for index, code_file in enumerate(code_files):
-        try:
-            with open(code_file, "r", encoding="utf-8") as f:
-                content = f.read()
-        except Exception as e:
-            print(f"코드 파일 {code_file} 읽기 오류: {e}")
-            continue
-
-        content = _strip_line_comments(content)
-        found_gfx = set()
-
-        for pattern in _COMPILED_PATTERNS:
-            for match in pattern.findall(content):
-                if isinstance(match, tuple):
-                    match = next((m for m in match if m), "")
-                if not match or not ("GFX" in match or match.startswith("GFX_")):
-                    continue
-
-                if "/" in match or "\\" in match:
-                    filename = os.path.splitext(os.path.basename(match))[0]
-                    if filename.startswith("GFX_") or "GFX" in filename:
-                        match = filename
-                    else:
-                        continue
-
-                match = match.strip("\"'")
-                if not (match and match in gfx_data):
-                    continue
-
-                gfx_definition_file = gfx_data[match]["file_source"]
-                if str(code_file) == gfx_definition_file:
-                    continue
-
-                found_gfx.add(match)
-                results["used_gfx"].add(match)
-                locations = results["usage_locations"].setdefault(match, [])
-                if str(code_file) not in locations:
-                    locations.append(str(code_file))
-
-        if found_gfx:
-            sample = list(found_gfx)[:5]
-            suffix = "..." if len(found_gfx) > 5 else ""
-            print(
-                f"Found {len(found_gfx)} GFX references in "
-                f"{code_file.name}: {', '.join(sample)}{suffix}"
-            )
-
+    for index, (code_file_str, found_gfx, error) in enumerate(scan_code_files(code_files, gfx_data)):
         if index % 10 == 0:
             emit(30 + int((index / total_files) * 50))
+        if error is not None:
+            print(f"코드 파일 {code_file_str} 읽기 오류: {error}")
+        for match in found_gfx:
+            results["used_gfx"].add(match)
+            results["usage_locations"].setdefault(match, []).append(code_file_str)
 
     emit(80)
 
+    find_related_used = _related_used_finder(results["used_gfx"])
     for gfx_name in gfx_data:
         if gfx_name in results["used_gfx"]:
             continue
-        base_name = gfx_name.replace("GFX_", "") if gfx_name.startswith("GFX_") else gfx_name
-        is_used = False
-        for used_gfx in results["used_gfx"]:
-            used_base = used_gfx.replace("GFX_", "") if used_gfx.startswith("GFX_") else used_gfx
-            if base_name == used_base or gfx_name in used_gfx or used_gfx in gfx_name:
-                is_used = True
-                if used_gfx in results["usage_locations"]:
-                    gfx_definition_file = gfx_data[gfx_name]["file_source"]
-                    locations = results["usage_locations"].setdefault(gfx_name, [])
-                    for usage_file in results["usage_locations"][used_gfx]:
-                        if usage_file != gfx_definition_file and usage_file not in locations:
-                            locations.append(usage_file)
-                break
-        if not is_used:
+        used_gfx = find_related_used(gfx_name)
+        if used_gfx is None:
             results["orphaned_gfx"].add(gfx_name)
+            continue
+        if used_gfx in results["usage_locations"]:
+            gfx_definition_file = gfx_data[gfx_name]["file_source"]
+            locations = results["usage_locations"].setdefault(gfx_name, [])
+            for usage_file in results["usage_locations"][used_gfx]:
+                if usage_file != gfx_definition_file and usage_file not in locations:
+                    locations.append(usage_file)
 
     for used_gfx in results["used_gfx"]:
         if used_gfx not in gfx_data:
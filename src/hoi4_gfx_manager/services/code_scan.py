@@ -0,0 +1,166 @@
+"""모드 코드 파일에서 GFX 참조를 찾는 스캐너 (Qt 비의존).
+
+`analysis.analyze_mod_folder()`가 쓰며, 프로세스 풀 워커가 이 모듈만 import하도록
+PyQt6나 다른 무거운 의존성을 불러오지 않는다.
+"""
+
+import math
+import multiprocessing
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+# 실측: 평균 12KB 코드 파일 검사는 파일당 약 1.3 ms, spawn 워커 기동은 리눅스에서 약 0.1 s이고
+# 윈도우는 진입 스크립트(Qt 포함)까지 다시 import하므로 약 0.5 s로 잡는다. 워커 4개면
+# 파일당 약 1 ms를 아끼므로 이보다 파일이 적으면 기동 비용을 되찾지 못한다.
+_PARALLEL_MIN_FILES = 500
+_SCAN_CHUNKSIZE = 32
+# 워커마다 인터프리터를 새로 띄우므로 코어가 많아도 이 이상은 쓰지 않는다.
+_MAX_SCAN_WORKERS = 8
+
+# 같은 모양의 패턴은 키워드 alternation으로 묶어 파일당 스캔 횟수를 줄인다.
+# 묶은 키워드는 비캡처 그룹이라 그룹 번호(\1 역참조 포함)는 그대로다.
+# alternation으로 시작하는 패턴은 첫 글자 lookahead를 앞에 두어, 키워드가 시작될 수 없는
+# 위치를 alternation 전체를 시도하지 않고 바로 건너뛴다. 매치 결과는 같다.
+_GFX_PATTERNS = [
+    r'(?=[bfghist])(?:icon|texture|spriteType|sprite|frame|background|highlight|glow)'
+    r'\s*=\s*(["\']?)([A-Za-z0-9_]+)\1',
+    r'(?=[aet])(?:texturefile|effectFile|animationmaskfile|animationtexturefile)'
+    r'\s*=\s*(["\']?)([A-Za-z0-9_./\\]+)\1',
+    r'buttonType\s*=\s*\{[^}]*?quadTextureSprite\s*=\s*(["\']?)([A-Za-z0-9_]+)\1',
+    r'iconType\s*=\s*\{[^}]*?spriteType\s*=\s*(["\']?)([A-Za-z0-9_]+)\1',
+    r'instantTextBoxType\s*=\s*\{[^}]*?font\s*=\s*(["\']?)([A-Za-z0-9_]+)\1',
+    r'GFX_[A-Za-z0-9_]+',
+    r'"(GFX_[^"]+)"',
+    r"'(GFX_[^']+)'",
+    r'@\[?([A-Za-z0-9_]*GFX[A-Za-z0-9_]*)\]?',
+    r'\$([A-Za-z0-9_]*GFX[A-Za-z0-9_]*)\$',
+    r'@(?:sprite|texture)\s*=\s*([A-Za-z0-9_]+)',
+    r'(?=[gs])(?:Get|Set)Sprite\s*\(\s*["\']([^"\'")]+)["\']\s*\)',
+]
+
+_COMPILED_PATTERNS = [
+    re.compile(p, re.IGNORECASE | re.MULTILINE | re.DOTALL) for p in _GFX_PATTERNS
+]
+
+# 줄 안의 문자열 리터럴 또는 `#` 주석. 문자열은 그대로 두고 주석만 지운다.
+# 바로 앞 글자가 `\`인 따옴표는 여닫지 않고, 닫히지 않은 문자열은 줄 끝까지 이어진다.
+_COMMENT_OR_STRING_RE = re.compile(r"""(?<!\\)(["'])(?:[^\n]*?(?<!\\)\1|[^\n]*)|#[^\n]*""")
+
+
+def _strip_line_comments(content: str) -> str:
+    """라인별로 `#` 주석 제거. 문자열 내부의 `#`은 유지."""
+    if "#" not in content:
+        return content
+    return _COMMENT_OR_STRING_RE.sub(_keep_strings, content)
+
+
+def _keep_strings(match):
+    return match.group() if match.group(1) else ""
+
+
+def _resolve_gfx_reference(match, gfx_data):
+    """패턴 매치를 gfx_data의 스프라이트 이름으로 해석한다. 해당 없으면 None."""
+    if not match or not ("GFX" in match or match.startswith("GFX_")):
+        return None
+
+    if "/" in match or "\\" in match:
+        filename = os.path.splitext(os.path.basename(match))[0]
+        if filename.startswith("GFX_") or "GFX" in filename:
+            match = filename
+        else:
+            return None
+
+    match = match.strip("\"'")
+    if not (match and match in gfx_data):
+        return None
+    return match
+
+
+def _scan_file(code_file, gfx_sources, resolved_names):
+    """코드 파일 하나에서 참조된 GFX 이름을 처음 나온 순서대로 모은다.
+
+    gfx_sources는 스프라이트 이름 -> 정의 파일 경로, resolved_names는 참조 문자열 해석 캐시다.
+    정의 파일 자신을 가리키는 참조는 제외한다. (파일 경로 문자열, 이름 리스트, 읽기 오류)를
+    돌려준다. 워커 프로세스에서도 불리므로 직접 출력하지 않고 오류를 돌려준다.
+    """
+    code_file_str = str(code_file)
+    # 아래 필터는 대소문자를 구분해 "GFX"를 포함한 매치만 받으므로,
+    # 파일에 "GFX"가 없으면 디코딩도 패턴 검사도 할 필요가 없다.
+    try:
+        raw = code_file.read_bytes()
+        if b"GFX" not in raw:
+            return code_file_str, [], None
+        content = raw.decode("utf-8")
+    except Exception as e:
+        return code_file_str, [], str(e)
+
+    content = _strip_line_comments(content)
+    # 파일마다 한 번만 기록하므로 dict로 중복을 거르며 순서를 유지한다.
+    found_gfx = {}
+
+    for pattern in _COMPILED_PATTERNS:
+        for match in pattern.findall(content):
+            if isinstance(match, tuple):
+                match = next((m for m in match if m), "")
+            if match in resolved_names:
+                match = resolved_names[match]
+            else:
+                match = resolved_names[match] = _resolve_gfx_reference(match, gfx_sources)
+            if match is None or match in found_gfx:
+                continue
+            if code_file_str == gfx_sources[match]:
+                continue
+            found_gfx[match] = None
+
+    return code_file_str, list(found_gfx), None
+
+
+_worker_state = None
+
+
+def _init_scan_worker(gfx_sources):
+    global _worker_state
+    _worker_state = (gfx_sources, {})
+
+
+def _scan_file_in_worker(code_file):
+    return _scan_file(code_file, *_worker_state)
+
+
+def scan_code_files(code_files, gfx_data):
+    """code_files 순서대로 _scan_file 결과를 내놓는다.
+
+    패턴 검사는 GIL을 잡은 채 도는 파이썬 코드이므로 파일이 많으면 프로세스 풀로 나눈다.
+    호출 측이 Qt 스레드이므로 fork 대신 항상 spawn으로 워커를 띄운다.
+    풀을 쓸 수 없거나 도중에 깨지면 남은 파일은 현재 프로세스에서 검사한다.
+    """
+    # 워커로 보낼 것은 이름과 정의 파일뿐이므로 gfx_data 전체를 피클링하지 않는다.
+    gfx_sources = {name: info["file_source"] for name, info in gfx_data.items()}
+
+    done = 0
+    max_workers = min(
+        os.cpu_count() or 1,
+        _MAX_SCAN_WORKERS,
+        math.ceil(len(code_files) / _SCAN_CHUNKSIZE),
+    )
+    if len(code_files) >= _PARALLEL_MIN_FILES and max_workers > 1:
+        try:
+            with ProcessPoolExecutor(
+                max_workers=max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_scan_worker,
+                initargs=(gfx_sources,),
+            ) as pool:
+                for scan in pool.map(_scan_file_in_worker, code_files, chunksize=_SCAN_CHUNKSIZE):
+                    yield scan
+                    done += 1
+            return
+        except (OSError, BrokenProcessPool) as e:
+            print(f"병렬 분석 실패, 남은 파일은 순차 분석으로 진행: {e}")
+
+    # 같은 참조 문자열은 모드 전체에서 반복되므로 해석 결과를 한 번만 계산한다.
+    resolved_names = {}
+    for code_file in code_files[done:]:
+        yield _scan_file(code_file, gfx_sources, resolved_names)
@@ -1,21 +1,68 @@
 """Focus GFX Shine 생성 서비스."""
 
+import mmap
+import os
 import re
 
 
+_GOAL_RE = re.compile(
+    r'name\s*=\s*"([^"]+)?"(?:[^}]*?)texturefile\s*=\s*"([^"]+)?"',
+    re.IGNORECASE,
+)
+_GOAL_NAME_RE = re.compile(r'name\s*=\s*"([^"]+)?"', re.IGNORECASE)
+_COMMENTS_RE = re.compile(r"#[^\n]*")
+# goals 파일은 mmap 위에서 바로 찾도록 같은 패턴의 bytes 버전을 쓴다.
+_GOAL_BYTES_RE = re.compile(_GOAL_RE.pattern.encode("ascii"), re.IGNORECASE)
+_COMMENTS_BYTES_RE = re.compile(_COMMENTS_RE.pattern.encode("ascii"))
+
+
+def _write_atomic(path, content):
+    """임시 파일에 다 쓴 뒤 교체해, 쓰는 도중 실패해도 원본이 깨지지 않게 한다."""
+    tmp_path = f"{path}.tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(content)
+            # 교체 전에 디스크까지 내려 두어야 OS가 죽어도 빈 파일이 남지 않는다.
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
 class FocusGFXShineGenerator:
     """Focus GFX에 누락된 shine 항목을 추가한다."""
 
-    def __init__(self):
-        self.goal_regex = re.compile(
-            r'name\s*=\s*"([^"]+)?"(?:[^}]*?)texturefile\s*=\s*"([^"]+)?"',
-            re.MULTILINE | re.DOTALL | re.IGNORECASE,
-        )
-        self.goal_name_regex = re.compile(
-            r'name\s*=\s*"([^"]+)?"',
-            re.MULTILINE | re.DOTALL | re.IGNORECASE,
-        )
-        self.comments_regex = re.compile(r"#.*$", re.MULTILINE)
+    # 인스턴스마다 다시 컴파일하지 않도록 모듈 상수를 공유한다.
+    goal_regex = _GOAL_RE
+    goal_name_regex = _GOAL_NAME_RE
+    comments_regex = _COMMENTS_RE
+    goal_bytes_regex = _GOAL_BYTES_RE
+    comments_bytes_regex = _COMMENTS_BYTES_RE
+
+    def _strip_comments(self, content):
+        # 주석이 없는 파일은 사본을 만들지 않고 그대로 쓴다.
+        if "#" not in content:
+            return content
+        return self.comments_regex.sub("", content)
+
+    def _find_goals(self, goals_file):
+        """goals 파일의 (name, texturefile) 목록. 파일 전체를 문자열로 읽지 않는다."""
+        with open(goals_file, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return []
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                content = mm
+                if mm.find(b"#") != -1:
+                    content = self.comments_bytes_regex.sub(b"", mm)
+                return [
+                    (name.decode("utf-8"), path.decode("utf-8"))
+                    for name, path in self.goal_bytes_regex.findall(content)
+                ]
 
     def get_shine_definition(self, name, path):
         rel_path = path.replace("\\", "/")
@@ -59,27 +106,14 @@ class FocusGFXShineGenerator:
                 goals_shine_content = f.read()
 
             goals_shine_matches = self.goal_name_regex.findall(
-                self.comments_regex.sub("", goals_shine_content)
+                self._strip_comments(goals_shine_content)
             )
             goals_shine_set = set(goals_shine_matches)
 
-            last_bracket_idx = 0
-            for i in range(len(goals_shine_content) - 1, -1, -1):
-                if goals_shine_content[i] == "}":
-                    last_bracket_idx = i
-                    break
+            # 닫는 괄호가 없으면 기존처럼 파일 맨 앞에 넣는다.
+            last_bracket_idx = max(goals_shine_content.rfind("}"), 0)
 
-            goals_shine_split = [
-                goals_shine_content[:last_bracket_idx],
-                goals_shine_content[last_bracket_idx:],
-            ]
-
-            with open(goals_file, "r", encoding="utf-8") as f:
-                goals_content = f.read()
-
-            goals_matches = self.goal_regex.findall(
-                self.comments_regex.sub("", goals_content)
-            )
+            goals_matches = self._find_goals(goals_file)
 
             missing_shine = {
                 name: path
@@ -87,15 +121,18 @@ class FocusGFXShineGenerator:
                 if f"{name}_shine" not in goals_shine_set
             }
 
-            added_count = 0
-            for name, path in missing_shine.items():
-                shine_def = self.get_shine_definition(name, path)
-                goals_shine_split.insert(1, shine_def)
-                added_count += 1
+            # 새 항목은 goals 파일 순서대로 마지막 `}` 앞에 붙인다.
+            shine_defs = [
+                self.get_shine_definition(name, path) for name, path in missing_shine.items()
+            ]
+            added_count = len(shine_defs)
 
             if added_count > 0:
-                with open(goals_shine_file, "w", encoding="utf-8") as f:
-                    f.write("\n".join(goals_shine_split))
+                _write_atomic(goals_shine_file, "\n".join([
+                    goals_shine_content[:last_bracket_idx],
+                    *shine_defs,
+                    goals_shine_content[last_bracket_idx:],
+                ]))
 
             return {
                 "success": True,
@@ -1,56 +1,163 @@
 """GFX 파일 파싱/저장/수정 서비스 (Qt 비의존)."""
 
+import codecs
 import os
 import re
+import sys
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from operator import itemgetter
 from pathlib import Path
 
-_SPRITE_BLOCK = re.compile(
-    r"spriteType\s*=\s*\{([^{}]*(?:\{[^{}]*\}[^{}]*)*)\}",
-    re.DOTALL | re.IGNORECASE,
-)
+_BRACE = re.compile(r"[{}]")
+_SPRITE_START = re.compile(r"spriteType\s*=\s*\{", re.IGNORECASE)
+_SPRITE_TYPES_START = re.compile(r"\bspriteTypes\s*=\s*\{", re.IGNORECASE)
 _NAME = re.compile(r'name\s*=\s*["\']?([^"\'}\s]+)["\']?', re.IGNORECASE)
 _TEXTURE = re.compile(r'texturefile\s*=\s*["\']?([^"\'}\s]+)["\']?', re.IGNORECASE)
+_TEXTURE_ASSIGN = re.compile(r'\btexturefile\s*=\s*(?:"[^"]*"|[^\s}]+)', re.IGNORECASE)
+_LINE_COMMENT = re.compile(r"#[^\n]*")
+
+
+@dataclass(frozen=True, slots=True)
+class SpriteEntry:
+    """.gfx 파일에서 읽은 spriteType 하나. 캐시에서 공유되므로 불변."""
+
+    name: str
+    texturefile: str
+    relative_path: str
+    file_source: str
+
+
+# 절대 경로 -> ((st_mtime_ns, st_size), mod_folder_path, entries)
+_PARSE_CACHE = {}
 
 
 def _strip_comments(content: str) -> str:
-    lines = []
-    for line in content.split("\n"):
-        if "#" in line:
-            line = line[: line.index("#")]
-        lines.append(line)
-    return "\n".join(lines)
+    return _LINE_COMMENT.sub("", content)
+
+
+def _mask_comments(content: str) -> str:
+    """주석을 같은 길이의 공백으로 덮는다. 원본과 오프셋이 일치한다."""
+    return _LINE_COMMENT.sub(lambda m: " " * len(m.group()), content)
+
+
+def _decode_gfx_bytes(raw: bytes) -> str:
+    """BOM 포함 UTF-8을 우선 시도하고, 실패하면 cp1252로 읽는다."""
+    try:
+        return raw.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        return raw.decode("cp1252", errors="replace")
+
+
+def _brace_events(content):
+    """파일 전체의 `{`/`}` 위치를 한 번에 수집한다: [(offset, char), ...]."""
+    return [(m.start(), m.group()) for m in _BRACE.finditer(content)]
+
+
+def _find_block_end(events, open_pos):
+    """`open_pos`의 `{`와 짝이 맞는 `}` 위치. 닫히지 않으면 -1."""
+    depth = 0
+    for index in range(bisect_left(events, open_pos, key=itemgetter(0)), len(events)):
+        pos, char = events[index]
+        depth += 1 if char == "{" else -1
+        if depth == 0:
+            return pos
+    return -1
+
+
+def _iter_sprite_blocks(content):
+    """spriteType 블록을 (헤더 시작, `{` 위치, `}` 위치)로 순서대로 돌려준다.
+
+    중첩 깊이에 제한이 없다.
+    """
+    events = _brace_events(content)
+    pos = 0
+    while True:
+        match = _SPRITE_START.search(content, pos)
+        if not match:
+            return
+        open_pos = match.end() - 1
+        close_pos = _find_block_end(events, open_pos)
+        if close_pos < 0:
+            pos = match.end()
+            continue
+        yield match.start(), open_pos, close_pos
+        pos = close_pos + 1
 
 
 def parse_gfx_file(gfx_file_path, mod_folder_path):
     """단일 .gfx 파일에서 spriteType 블록을 파싱해 엔트리 리스트를 돌려준다.
 
-    각 엔트리는 dict로 반환된다: name, texturefile(절대), relative_path, file_source.
+    각 엔트리는 SpriteEntry로 반환된다: name, texturefile(절대), relative_path, file_source.
     중복 여부/상태 판정은 호출 측에서 처리한다.
+    파일의 수정 시각과 크기가 그대로면 이전 파싱 결과를 재사용한다.
     """
+    try:
+        st = os.stat(gfx_file_path)
+    except OSError as e:
+        raise RuntimeError(f"파일 {gfx_file_path} 읽기 실패: {e}") from e
+
+    cache_key = os.path.abspath(gfx_file_path)
+    stamp = (st.st_mtime_ns, st.st_size)
+    cached = _PARSE_CACHE.get(cache_key)
+    if cached is not None and cached[:2] == (stamp, mod_folder_path):
+        return list(cached[2])
+
     entries = []
     try:
-        with open(gfx_file_path, "r", encoding="utf-8") as f:
-            content = f.read()
+        raw = Path(gfx_file_path).read_bytes()
     except OSError as e:
         raise RuntimeError(f"파일 {gfx_file_path} 읽기 실패: {e}") from e
 
-    content = _strip_comments(content)
+    content = _strip_comments(_decode_gfx_bytes(raw))
+    file_source = str(gfx_file_path)
 
-    for sprite_content in _SPRITE_BLOCK.findall(content):
-        name_match = _NAME.search(sprite_content)
-        texture_match = _TEXTURE.search(sprite_content)
+    for _, open_pos, close_pos in _iter_sprite_blocks(content):
+        name_match = _NAME.search(content, open_pos + 1, close_pos)
+        texture_match = _TEXTURE.search(content, open_pos + 1, close_pos)
         if not (name_match and texture_match):
             continue
-        name = name_match.group(1).strip("\"'")
+        name = sys.intern(name_match.group(1).strip("\"'"))
         texture_path = texture_match.group(1).strip("\"'")
         full_texture_path = os.path.join(mod_folder_path, texture_path)
-        entries.append({
-            "name": name,
-            "texturefile": full_texture_path,
-            "relative_path": texture_path,
-            "file_source": str(gfx_file_path),
-        })
-    return entries
+        entries.append(SpriteEntry(name, full_texture_path, texture_path, file_source))
+
+    _PARSE_CACHE[cache_key] = (stamp, mod_folder_path, entries)
+    return list(entries)
+
+
+def _read_gfx_for_edit(gfx_file_path):
+    """수정할 .gfx를 스캔과 같은 규칙으로 읽어 (내용, 다시 쓸 인코딩)을 돌려준다.
+
+    읽은 인코딩 그대로 다시 써서 건드리지 않은 부분의 바이트가 바뀌지 않게 한다.
+    cp1252에 정의되지 않은 바이트는 surrogateescape로 보존한다.
+    줄바꿈은 기존 텍스트 모드 읽기처럼 `\n`으로 맞춘다.
+    """
+    raw = Path(gfx_file_path).read_bytes()
+    try:
+        content = raw.decode("utf-8-sig")
+        encoding = "utf-8-sig" if raw.startswith(codecs.BOM_UTF8) else "utf-8"
+    except UnicodeDecodeError:
+        content = raw.decode("cp1252", errors="surrogateescape")
+        encoding = "cp1252"
+    return content.replace("\r\n", "\n").replace("\r", "\n"), encoding
+
+
+def _write_gfx_file(gfx_file_path, content, encoding="utf-8"):
+    # 같은 크기로 다시 쓰이면 mtime 해상도에 따라 캐시가 못 알아챌 수 있다.
+    _PARSE_CACHE.pop(os.path.abspath(gfx_file_path), None)
+    with open(gfx_file_path, "w", encoding=encoding, errors="surrogateescape") as f:
+        f.write(content)
+
+
+def _parse_and_check(gfx_file, mod_folder_path):
+    """파싱 결과와 엔트리별 텍스처 존재 여부. 읽기 실패는 예외 대신 돌려준다."""
+    try:
+        entries = parse_gfx_file(gfx_file, mod_folder_path)
+    except RuntimeError as e:
+        return e
+    return entries, [os.path.exists(entry.texturefile) for entry in entries]
 
 
 def scan_mod_folder(mod_folder_path):
@@ -63,29 +170,38 @@ def scan_mod_folder(mod_folder_path):
     duplicates = {}
 
     gfx_files = list(Path(mod_folder_path).rglob("*.gfx"))
-    for gfx_file in gfx_files:
-        try:
-            entries = parse_gfx_file(gfx_file, mod_folder_path)
-        except RuntimeError as e:
-            print(e)
+    # 정규식 파싱은 GIL을 잡고 돌지만, 파일 읽기와 엔트리마다의 텍스처 존재 확인(stat)은
+    # GIL을 놓는 I/O이므로 둘 다 작업 안에서 해 스레드로 겹친다.
+    # map은 입력 순서를 유지하므로 중복 판정 순서도 직렬 스캔과 같다.
+    with ThreadPoolExecutor(max_workers=min(8, (os.cpu_count() or 1) + 4)) as pool:
+        results = list(pool.map(_parse_and_check, gfx_files, [mod_folder_path] * len(gfx_files)))
+
+    # 캐시는 마지막 스캔의 파일만 유지한다. 삭제된 파일이나 이전에 연 다른 모드 폴더의
+    # 엔트리가 세션 내내 쌓이지 않게 한다.
+    for stale_key in _PARSE_CACHE.keys() - {os.path.abspath(gfx_file) for gfx_file in gfx_files}:
+        del _PARSE_CACHE[stale_key]
+
+    for result in results:
+        if isinstance(result, RuntimeError):
+            print(result)
             continue
 
-        for entry in entries:
-            name = entry["name"]
-            status = "valid" if os.path.exists(entry["texturefile"]) else "missing_file"
+        for entry, exists in zip(*result):
+            name = entry.name
+            status = "valid" if exists else "missing_file"
 
             if name in gfx_data:
                 status = "duplicate"
                 if name in duplicates:
-                    duplicates[name].append(entry["file_source"])
+                    duplicates[name].append(entry.file_source)
                 else:
-                    duplicates[name] = [gfx_data[name]["file_source"], entry["file_source"]]
+                    duplicates[name] = [gfx_data[name]["file_source"], entry.file_source]
 
             gfx_data[name] = {
-                "texturefile": entry["texturefile"],
-                "file_source": entry["file_source"],
+                "texturefile": entry.texturefile,
+                "file_source": entry.file_source,
                 "status": status,
-                "relative_path": entry["relative_path"],
+                "relative_path": entry.relative_path,
             }
 
     return gfx_data, duplicates, gfx_files
@@ -104,40 +220,65 @@ def save_gfx_to_file(gfx_file_path, name, relative_texture_path):
         "\n\t}"
     )
 
-    with open(gfx_file_path, "r", encoding="utf-8") as f:
-        content = f.read()
+    content, encoding = _read_gfx_for_edit(gfx_file_path)
 
-    if "spriteTypes = {" in content:
-        last_brace = content.rfind("}")
-        content = content[:last_brace] + gfx_entry + "\n" + content[last_brace:]
+    # 마지막 `}`가 아니라 spriteTypes 블록의 닫는 괄호 앞에 넣는다.
+    masked = _mask_comments(content)
+    header = _SPRITE_TYPES_START.search(masked)
+    close_pos = _find_block_end(_brace_events(masked), header.end() - 1) if header else -1
+    if close_pos >= 0:
+        content = content[:close_pos] + gfx_entry + "\n" + content[close_pos:]
     else:
         content += f"\n\nspriteTypes = {{{gfx_entry}\n}}\n"
 
-    with open(gfx_file_path, "w", encoding="utf-8") as f:
-        f.write(content)
+    _write_gfx_file(gfx_file_path, content, encoding)
 
 
 def remove_gfx_from_file(gfx_file_path, name):
     """`.gfx` 파일에서 지정된 spriteType 블록을 삭제한다."""
-    with open(gfx_file_path, "r", encoding="utf-8") as f:
-        content = f.read()
+    content, encoding = _read_gfx_for_edit(gfx_file_path)
+    # 이름이 아예 없으면 블록을 훑거나 파일을 다시 쓸 필요가 없다.
+    if name not in content:
+        return
 
-    pattern = rf'spriteType\s*=\s*\{{\s*name\s*=\s*["\']?{re.escape(name)}["\']?[^}}]*\}}'
-    content = re.sub(pattern, "", content, flags=re.DOTALL)
+    masked = _mask_comments(content)
+    spans = []
+    for start, open_pos, close_pos in _iter_sprite_blocks(masked):
+        name_match = _NAME.search(masked, open_pos + 1, close_pos)
+        if name_match and name_match.group(1).strip("\"'") == name:
+            spans.append((start, close_pos + 1))
+    if not spans:
+        return
 
-    with open(gfx_file_path, "w", encoding="utf-8") as f:
-        f.write(content)
+    for start, end in reversed(spans):
+        content = content[:start] + content[end:]
+
+    _write_gfx_file(gfx_file_path, content, encoding)
 
 
 def update_gfx_texture_path(gfx_file_path, name, new_relative_path):
     """기존 spriteType의 texturefile만 교체한다."""
-    with open(gfx_file_path, "r", encoding="utf-8") as f:
-        content = f.read()
+    content, encoding = _read_gfx_for_edit(gfx_file_path)
+    # 이름이 아예 없으면 블록을 훑거나 파일을 다시 쓸 필요가 없다.
+    if name not in content:
+        return
 
     rel_new_path = new_relative_path.replace("\\", "/")
-    pattern = rf'({re.escape(name)}\s*=\s*\{{[^}}]*?)texturefile\s*=\s*"[^"]*"'
-    replacement = rf'\1texturefile = "{rel_new_path}"'
-    content = re.sub(pattern, replacement, content, flags=re.DOTALL | re.MULTILINE | re.IGNORECASE)
+    replacement = f'texturefile = "{rel_new_path}"'
 
-    with open(gfx_file_path, "w", encoding="utf-8") as f:
-        f.write(content)
+    masked = _mask_comments(content)
+    spans = []
+    for _, open_pos, close_pos in _iter_sprite_blocks(masked):
+        name_match = _NAME.search(masked, open_pos + 1, close_pos)
+        if not (name_match and name_match.group(1).strip("\"'") == name):
+            continue
+        texture_match = _TEXTURE_ASSIGN.search(masked, open_pos + 1, close_pos)
+        if texture_match:
+            spans.append(texture_match.span())
+    if not spans:
+        return
+
+    for start, end in reversed(spans):
+        content = content[:start] + replacement + content[end:]
+
+    _write_gfx_file(gfx_file_path, content, encoding)
@@ -1,5 +1,9 @@
 """이미지 변환 서비스 (Qt 비의존)."""
 
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
 from pathlib import Path
 
 import cv2
@@ -7,10 +11,26 @@ import numpy as np
 from PIL import Image
 
 try:  # pragma: no cover - DDS 플러그인은 선택적
-    from PIL import DdsImagePlugin  # noqa: F401
+    from PIL import DdsImagePlugin  # noqa: F401 - import 시 DDS 저장기를 Image.SAVE에 등록한다.
 except ImportError:
     pass
 
+# Pillow DDS 저장기가 등록돼 있으면 BCn 압축까지 직접 인코딩한다. 없으면 OpenCV 비압축 경로로 쓴다.
+_HAS_PILLOW_DDS_WRITER = "DDS" in getattr(Image, "SAVE", {})
+# DDS_FORMATS 값 -> Pillow의 pixel_format. BC7은 Pillow도 OpenCV도 인코딩하지 못해 제공하지 않는다.
+_PILLOW_DDS_PIXEL_FORMATS = {"DXT1": "DXT1", "DXT3": "DXT3", "DXT5": "DXT5"}
+_PILLOW_DDS_UNCOMPRESSED = {"RGBA": "RGBA", "RGB": "RGB"}
+
+
+@dataclass(frozen=True, slots=True)
+class ConvertResult:
+    """batch_convert 결과 한 건. 실패하면 error에 사유가 들어간다."""
+
+    input: str
+    output: str
+    success: bool
+    error: str | None
+
 
 class ImageConverter:
     """이미지 일괄 변환 클래스."""
@@ -22,7 +42,6 @@ class ImageConverter:
         "DXT1 (BC1)": "DXT1",
         "DXT3 (BC2)": "DXT3",
         "DXT5 (BC3)": "DXT5",
-        "BC7": "BC7",
         "R8G8B8": "RGB",
         "R8G8B8A8": "RGBA",
     }
@@ -31,29 +50,59 @@ class ImageConverter:
         self.supported_input = [".png", ".jpg", ".jpeg", ".bmp", ".tiff", ".tga"]
         self.supported_output = [".png", ".jpg", ".jpeg", ".bmp", ".dds"]
 
+    def _target_mode(self, img, output_format, dds_format):
+        """저장 전에 맞출 이미지 모드. None이면 원본 모드 그대로 저장한다.
+
+        변환은 파일당 최대 한 번만 일어나도록 여기서 한꺼번에 정한다.
+        알파가 있는 이미지의 JPG 저장은 흰 배경 합성으로 따로 처리한다.
+        """
+        output_format = output_format.upper()
+        has_alpha = img.mode in ("RGBA", "LA") or "transparency" in img.info
+        if output_format in ("JPG", "JPEG"):
+            return "RGB"
+        if output_format == "DDS":
+            # Pillow 비압축 R8G8B8은 저장 직전에 RGB로 바꾸므로 RGBA를 거치지 않는다.
+            if _HAS_PILLOW_DDS_WRITER and dds_format == "RGB":
+                return "RGB"
+            if has_alpha or dds_format in ("RGBA", "DXT3", "DXT5"):
+                return "RGBA"
+            return None
+        return "RGBA" if has_alpha else None
+
+    @staticmethod
+    def _can_copy_unchanged(img, output_format):
+        # 무손실 포맷끼리 같은 포맷으로 "변환"하면 디코드/인코드 없이 파일 복사로 충분하다.
+        # 확장자가 아니라 헤더로 읽은 실제 포맷을 보므로 손상되거나 내용이 다른 파일은 복사하지 않는다.
+        # JPG(품질)와 DDS(압축 포맷)는 설정에 따라 결과가 달라지므로 항상 다시 인코딩한다.
+        output_format = output_format.upper()
+        return output_format in ("PNG", "BMP") and img.format == output_format
+
     def convert_image(self, input_path, output_path, output_format="PNG", dds_format="RGBA", quality=95):
         """단일 이미지를 지정된 포맷으로 변환."""
         try:
+            # Image.open은 헤더만 읽고 픽셀 디코드는 load()/convert()/save()까지 미룬다.
             with Image.open(input_path) as img:
-                if img.mode in ("RGBA", "LA") or "transparency" in img.info:
-                    if output_format.upper() == "DDS":
-                        if img.mode != "RGBA":
-                            img = img.convert("RGBA")
-                    elif output_format.upper() in ["JPG", "JPEG"]:
-                        background = Image.new("RGB", img.size, (255, 255, 255))
-                        if img.mode == "RGBA":
-                            background.paste(img, mask=img.split()[3])
-                        else:
-                            background.paste(img)
-                        img = background
+                if self._can_copy_unchanged(img, output_format):
+                    try:
+                        shutil.copyfile(input_path, output_path)
+                    except shutil.SameFileError:
+                        pass
+                    return True, None
+
+                has_alpha = img.mode in ("RGBA", "LA") or "transparency" in img.info
+                if has_alpha and output_format.upper() in ("JPG", "JPEG"):
+                    background = Image.new("RGB", img.size, (255, 255, 255))
+                    if img.mode == "RGBA":
+                        # RGBA 이미지를 마스크로 넘기면 알파 밴드를 그대로 쓰므로 split()이 만드는
+                        # 밴드 이미지 4개를 할당하지 않는다.
+                        background.paste(img, mask=img)
                     else:
-                        if img.mode != "RGBA":
-                            img = img.convert("RGBA")
+                        background.paste(img)
+                    img = background
                 else:
-                    if output_format.upper() == "DDS" and dds_format in ["RGBA", "DXT3", "DXT5"]:
-                        img = img.convert("RGBA")
-                    elif output_format.upper() in ["JPG", "JPEG"]:
-                        img = img.convert("RGB")
+                    target_mode = self._target_mode(img, output_format, dds_format)
+                    if target_mode is not None and img.mode != target_mode:
+                        img = img.convert(target_mode)
 
                 if output_format.upper() == "DDS":
                     self._save_as_dds(img, output_path, dds_format)
@@ -73,18 +122,15 @@ class ImageConverter:
             return False, str(e)
 
     def _save_as_dds(self, img, output_path, dds_format):
-        """OpenCV로 DDS 저장 후 매직 헤더 검증."""
+        """Pillow(가능하면) 또는 OpenCV로 DDS 저장 후 매직 헤더 검증."""
+        if dds_format not in _PILLOW_DDS_PIXEL_FORMATS and dds_format not in _PILLOW_DDS_UNCOMPRESSED:
+            # 어느 인코더도 쓰지 못하는 포맷은 파일을 건드리기 전에 거절한다.
+            raise RuntimeError(f"DDS format '{dds_format}' is not supported.")
         try:
-            if img.mode == "RGBA":
-                img_array = np.array(img)
-                img_bgra = cv2.cvtColor(img_array, cv2.COLOR_RGBA2BGRA)
+            if _HAS_PILLOW_DDS_WRITER:
+                self._write_dds_with_pillow(img, output_path, dds_format)
             else:
-                img_array = np.array(img.convert("RGB"))
-                img_bgra = cv2.cvtColor(img_array, cv2.COLOR_RGB2BGR)
-
-            success = cv2.imwrite(output_path, img_bgra)
-            if not success:
-                raise RuntimeError(f"OpenCV failed to write DDS data for '{dds_format}'.")
+                self._write_dds_with_opencv(img, output_path, dds_format)
 
             with open(output_path, "rb") as dds_file:
                 if dds_file.read(4) != self.DDS_MAGIC:
@@ -98,33 +144,92 @@ class ImageConverter:
                 pass
             raise RuntimeError(f"DDS conversion failed: {e}") from e
 
-    def batch_convert(self, file_list, output_dir, output_format="PNG", dds_format="RGBA", quality=95):
-        """파일 목록을 일괄 변환."""
-        results = []
-
-        for input_file in file_list:
+    def _write_dds_with_pillow(self, img, output_path, dds_format):
+        if dds_format in _PILLOW_DDS_PIXEL_FORMATS:
+            # Pillow DDS 저장기는 P, 1, I;16, CMYK 같은 모드를 받지 않으므로 RGB(A)로 맞춘다.
+            if img.mode not in ("RGB", "RGBA"):
+                has_alpha = img.mode in ("LA", "PA") or "transparency" in img.info
+                img = img.convert("RGBA" if has_alpha else "RGB")
+            img.save(output_path, format="DDS", pixel_format=_PILLOW_DDS_PIXEL_FORMATS[dds_format])
+            return
+        # 비압축은 모드로 결정된다: RGBA -> B8G8R8A8, RGB -> R8G8B8.
+        mode = _PILLOW_DDS_UNCOMPRESSED[dds_format]
+        if img.mode != mode:
+            img = img.convert(mode)
+        img.save(output_path, format="DDS")
+
+    def _write_dds_with_opencv(self, img, output_path, dds_format):
+        # np.array가 만든 버퍼 하나에서 R/B만 제자리로 바꿔 이미지 크기 버퍼를 더 만들지 않는다.
+        if img.mode == "RGBA":
+            img_array = np.array(img)
+            img_bgra = cv2.cvtColor(img_array, cv2.COLOR_RGBA2BGRA, dst=img_array)
+        else:
+            img_array = np.array(img if img.mode == "RGB" else img.convert("RGB"))
+            img_bgra = cv2.cvtColor(img_array, cv2.COLOR_RGB2BGR, dst=img_array)
+
+        success = cv2.imwrite(output_path, img_bgra)
+        if not success:
+            raise RuntimeError(f"OpenCV failed to write DDS data for '{dds_format}'.")
+
+    def batch_convert(self, file_list, output_dir, output_format="PNG", dds_format="RGBA", quality=95,
+                      progress_callback=None, result_callback=None, cancel_event=None):
+        """파일 목록을 일괄 변환. 결과는 입력 순서를 따르는 ConvertResult 리스트다.
+
+        디코드/인코드는 PIL/OpenCV 안에서 GIL을 놓으므로 스레드로 병렬 처리한다.
+        progress_callback(done, total)과 result_callback(result)은 batch_convert를
+        호출한 스레드에서 파일이 끝나는 순서대로 불린다.
+        cancel_event(threading.Event)가 설정되면 아직 시작하지 않은 파일은 변환하지 않고
+        실패("cancelled")로 기록한다. 이미 변환 중인 파일은 끝까지 처리한다.
+        """
+        file_list = list(file_list)
+        total = len(file_list)
+        results = [None] * total
+        paths = [None] * total
+        done = 0
+
+        # 출력 경로는 파일마다 Path 객체를 만들지 않고 문자열 연산으로 계산한다.
+        out_dir = os.fspath(output_dir)
+        suffix = "." + output_format.lower()
+
+        # 출력 경로가 같은 입력(같은 stem)은 한 작업에서 입력 순서대로 처리한다.
+        # 직렬 변환과 마찬가지로 마지막 입력이 남는다.
+        groups = {}
+        for index, input_file in enumerate(file_list):
             try:
-                input_path = Path(input_file)
-                output_filename = input_path.stem + "." + output_format.lower()
-                output_path = Path(output_dir) / output_filename
-
+                input_str = os.fspath(input_file)
+                stem = os.path.splitext(os.path.basename(input_str))[0]
+                output_path = os.path.join(out_dir, stem + suffix)
+            except TypeError as e:
+                results[index] = ConvertResult(str(input_file), "", False, str(e))
+                done += 1
+                if result_callback is not None:
+                    result_callback(results[index])
+                continue
+            paths[index] = (input_str, output_path)
+            groups.setdefault(os.path.normcase(output_path), []).append(index)
+
+        def convert_group(indices):
+            for index in indices:
+                input_str, output_path = paths[index]
+                if cancel_event is not None and cancel_event.is_set():
+                    results[index] = ConvertResult(input_str, output_path, False, "cancelled")
+                    continue
                 success, error = self.convert_image(
-                    str(input_path), str(output_path), output_format, dds_format, quality
+                    input_str, output_path, output_format, dds_format, quality
                 )
-
-                results.append({
-                    "input": str(input_path),
-                    "output": str(output_path),
-                    "success": success,
-                    "error": error,
-                })
-
-            except Exception as e:
-                results.append({
-                    "input": str(input_file),
-                    "output": "",
-                    "success": False,
-                    "error": str(e),
-                })
+                results[index] = ConvertResult(input_str, output_path, success, error)
+            return indices
+
+        max_workers = max(1, min(os.cpu_count() or 1, len(groups)))
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = [pool.submit(convert_group, indices) for indices in groups.values()]
+            for future in as_completed(futures):
+                indices = future.result()
+                done += len(indices)
+                if result_callback is not None:
+                    for index in indices:
+                        result_callback(results[index])
+                if progress_callback is not None:
+                    progress_callback(done, total)
 
         return results
@@ -1,15 +1,48 @@
 """GFX 일괄 변환 다이얼로그."""
 
 import os
-from pathlib import Path
+import threading
 
+from PyQt6.QtCore import QThread, pyqtSignal
 from PyQt6.QtWidgets import (
-    QApplication, QComboBox, QDialog, QFileDialog, QFormLayout, QGroupBox,
+    QComboBox, QDialog, QFileDialog, QFormLayout, QGroupBox,
     QHBoxLayout, QLabel, QLineEdit, QListWidget, QMessageBox, QProgressBar,
     QPushButton, QSpinBox, QTextEdit, QVBoxLayout,
 )
 
 from ...services.image_conversion import ImageConverter
+from ..file_walk import iter_files
+
+
+class ConvertWorker(QThread):
+    """일괄 변환을 백그라운드에서 실행하는 Qt 워커."""
+
+    progress_updated = pyqtSignal(int)
+    file_converted = pyqtSignal(object)
+    conversion_complete = pyqtSignal(list)
+
+    def __init__(self, converter, file_list, output_dir, output_format, dds_format, quality):
+        super().__init__()
+        self.converter = converter
+        self.file_list = list(file_list)
+        self.output_dir = output_dir
+        self.output_format = output_format
+        self.dds_format = dds_format
+        self.quality = quality
+        self._cancel_event = threading.Event()
+
+    def cancel(self):
+        """아직 시작하지 않은 파일은 건너뛰게 한다. 변환 중인 파일은 끝까지 처리된다."""
+        self._cancel_event.set()
+
+    def run(self):
+        results = self.converter.batch_convert(
+            self.file_list, self.output_dir, self.output_format, self.dds_format, self.quality,
+            progress_callback=lambda done, total: self.progress_updated.emit(done),
+            result_callback=self.file_converted.emit,
+            cancel_event=self._cancel_event,
+        )
+        self.conversion_complete.emit(results)
 
 
 class BatchConvertDialog(QDialog):
@@ -23,6 +56,11 @@ class BatchConvertDialog(QDialog):
         self.mod_folder_path = mod_folder_path
         self.converter = ImageConverter()
         self.selected_files = []
+        self._success_count = 0
+        self._error_count = 0
+        # selected_files 중복 검사용. 폴더 단위로 수천 개를 추가해도 목록을 훑지 않는다.
+        self._selected_set = set()
+        self.convert_worker = None
 
         self._init_ui()
 
@@ -81,8 +119,9 @@ class BatchConvertDialog(QDialog):
         settings_layout.addRow("출력 포맷:", self.format_combo)
 
         self.dds_format_combo = QComboBox()
-        for format_name in ImageConverter.DDS_FORMATS.keys():
-            self.dds_format_combo.addItem(format_name)
+        # 표시 이름과 함께 변환 코드를 항목 데이터로 넣어 두고 currentData()로 꺼낸다.
+        for format_name, dds_format in ImageConverter.DDS_FORMATS.items():
+            self.dds_format_combo.addItem(format_name, dds_format)
         self.dds_format_combo.setCurrentText("B8G8R8A8 (Linear, A8R8G8B8)")
         settings_layout.addRow("DDS 포맷:", self.dds_format_combo)
 
@@ -125,30 +164,38 @@ class BatchConvertDialog(QDialog):
     def _default_path(self):
         return self.mod_folder_path or os.path.expanduser("~/Documents")
 
+    def _append_files(self, entries):
+        """(경로, 목록 표시 이름) 중 새 파일만 추가하고 목록 위젯에는 한 번에 넣는다."""
+        labels = []
+        for file_path, label in entries:
+            if file_path not in self._selected_set:
+                self._selected_set.add(file_path)
+                self.selected_files.append(file_path)
+                labels.append(label)
+        if not labels:
+            return
+        self.file_list.setUpdatesEnabled(False)
+        try:
+            self.file_list.addItems(labels)
+        finally:
+            self.file_list.setUpdatesEnabled(True)
+
     def add_files(self):
         files, _ = QFileDialog.getOpenFileNames(
             self, "변환할 이미지 파일 선택", self._default_path(),
             "이미지 파일 (*.png *.jpg *.jpeg *.bmp *.tiff *.tga);;모든 파일 (*)",
         )
-        for file in files:
-            if file not in self.selected_files:
-                self.selected_files.append(file)
-                self.file_list.addItem(os.path.basename(file))
+        self._append_files((file, os.path.basename(file)) for file in files)
 
     def add_folder(self):
         folder = QFileDialog.getExistingDirectory(self, "이미지 폴더 선택", self._default_path())
         if not folder:
             return
-        extensions = [".png", ".jpg", ".jpeg", ".bmp", ".tiff", ".tga"]
-        for ext in extensions:
-            for file_path in Path(folder).rglob(f"*{ext}"):
-                file_str = str(file_path)
-                if file_str not in self.selected_files:
-                    self.selected_files.append(file_str)
-                    self.file_list.addItem(os.path.relpath(file_str, folder))
+        self._append_files(iter_files(folder, self.converter.supported_input))
 
     def clear_files(self):
         self.selected_files.clear()
+        self._selected_set.clear()
         self.file_list.clear()
 
     def browse_output_dir(self):
@@ -169,7 +216,7 @@ class BatchConvertDialog(QDialog):
         os.makedirs(output_dir, exist_ok=True)
 
         output_format = self.format_combo.currentText()
-        dds_format = ImageConverter.DDS_FORMATS[self.dds_format_combo.currentText()]
+        dds_format = self.dds_format_combo.currentData()
         quality = self.quality_spin.value()
 
         self.progress_bar.setVisible(True)
@@ -177,28 +224,33 @@ class BatchConvertDialog(QDialog):
         self.progress_bar.setValue(0)
         self.result_text.setVisible(True)
         self.result_text.clear()
+        self.result_text.append("=== 변환 결과 ===\n")
+        self._success_count = 0
+        self._error_count = 0
         self.convert_btn.setEnabled(False)
 
-        results = self.converter.batch_convert(
-            self.selected_files, output_dir, output_format, dds_format, quality
+        self.convert_worker = ConvertWorker(
+            self.converter, self.selected_files, output_dir, output_format, dds_format, quality
         )
+        self.convert_worker.progress_updated.connect(self.progress_bar.setValue)
+        self.convert_worker.file_converted.connect(self._on_file_converted)
+        self.convert_worker.conversion_complete.connect(self._on_conversion_complete)
+        self.convert_worker.start()
+
+    def _on_file_converted(self, result):
+        # 끝나는 대로 한 줄씩 덧붙여 진행 상황을 바로 보여 준다.
+        in_name = os.path.basename(result.input)
+        if result.success:
+            self._success_count += 1
+            self.result_text.append(f"✓ {in_name} → {os.path.basename(result.output)}")
+        else:
+            self._error_count += 1
+            self.result_text.append(f"✗ {in_name}: {result.error}")
 
-        success_count = 0
-        error_count = 0
-        lines = ["=== 변환 결과 ===\n"]
-        for i, result in enumerate(results):
-            self.progress_bar.setValue(i + 1)
-            QApplication.processEvents()
-            in_name = os.path.basename(result["input"])
-            if result["success"]:
-                success_count += 1
-                lines.append(f"✓ {in_name} → {os.path.basename(result['output'])}")
-            else:
-                error_count += 1
-                lines.append(f"✗ {in_name}: {result['error']}")
-
-        lines.append(f"\n성공: {success_count}개, 실패: {error_count}개")
-        self.result_text.setText("\n".join(lines))
+    def _on_conversion_complete(self, results):
+        success_count = self._success_count
+        error_count = self._error_count
+        self.result_text.append(f"\n성공: {success_count}개, 실패: {error_count}개")
 
         self.convert_btn.setEnabled(True)
 
@@ -206,3 +258,19 @@ class BatchConvertDialog(QDialog):
             QMessageBox.information(self, "완료", f"모든 파일이 성공적으로 변환되었습니다.\n변환된 파일: {success_count}개")
         else:
             QMessageBox.warning(self, "변환 완료", f"변환이 완료되었습니다.\n성공: {success_count}개, 실패: {error_count}개")
+
+    def done(self, result):
+        worker = self.convert_worker
+        if worker is not None:
+            # 닫힌 다이얼로그에 진행/완료 신호(완료 메시지 박스 포함)가 오지 않도록 끊는다.
+            for signal in (worker.progress_updated, worker.file_converted, worker.conversion_complete):
+                try:
+                    signal.disconnect()
+                except TypeError:
+                    pass
+            # 남은 파일은 건너뛰게 하고, QThread가 실행 중에 파괴되지 않도록
+            # 이미 변환 중인 파일만 끝나기를 기다린다.
+            worker.cancel()
+            worker.wait()
+            self.convert_worker = None
+        super().done(result)
@@ -1,14 +1,23 @@
 """폴더 전체 이미지를 일괄 임포트하는 다이얼로그."""
 
 import os
-from pathlib import Path
+from itertools import islice
 
+from PyQt6.QtCore import QTimer
 from PyQt6.QtWidgets import (
     QCheckBox, QComboBox, QDialog, QDialogButtonBox, QFileDialog, QFormLayout,
     QGroupBox, QHBoxLayout, QLabel, QLineEdit, QPushButton, QRadioButton,
     QTextEdit, QVBoxLayout,
 )
 
+from ..file_walk import iter_files
+from ..theme import IMAGE_EXTENSIONS
+
+# 입력이 멈춘 뒤 이만큼 지나서 미리보기를 갱신한다 (ms).
+_PREVIEW_DELAY_MS = 200
+# 미리보기에 보여 줄 최대 항목 수.
+_PREVIEW_LIMIT = 20
+
 
 class BatchImportDialog(QDialog):
     """여러 이미지를 한 번에 GFX로 등록."""
@@ -83,6 +92,11 @@ class BatchImportDialog(QDialog):
         buttons.rejected.connect(self.reject)
         layout.addWidget(buttons)
 
+        # 글자를 입력할 때마다 폴더를 훑지 않도록 미리보기 갱신을 모아서 한 번만 한다.
+        self._preview_timer = QTimer(self)
+        self._preview_timer.setSingleShot(True)
+        self._preview_timer.timeout.connect(self._refresh_preview)
+
         self.folder_edit.textChanged.connect(self.update_preview)
         self.prefix_edit.textChanged.connect(self.update_preview)
         self.dest_folder_edit.textChanged.connect(self.update_preview)
@@ -128,6 +142,9 @@ class BatchImportDialog(QDialog):
         self.update_preview()
 
     def update_preview(self):
+        self._preview_timer.start(_PREVIEW_DELAY_MS)
+
+    def _refresh_preview(self):
         folder = self.folder_edit.text()
         prefix = self.prefix_edit.text()
 
@@ -137,23 +154,22 @@ class BatchImportDialog(QDialog):
 
         lines = ["생성될 GFX 항목들:\n"]
 
-        image_extensions = [".dds", ".png", ".jpg", ".jpeg", ".bmp", ".tga"]
-        image_files = []
-        for ext in image_extensions:
-            pattern = f"**/*{ext}" if self.recursive_cb.isChecked() else f"*{ext}"
-            image_files.extend(list(Path(folder).glob(pattern)))
+        # 보여 줄 만큼보다 하나만 더 찾으면 "더 있음"을 알 수 있으므로 나머지 트리는 훑지 않는다.
+        image_files = list(islice(
+            iter_files(folder, IMAGE_EXTENSIONS, self.recursive_cb.isChecked()), _PREVIEW_LIMIT + 1
+        ))
 
-        for image_file in image_files[:20]:
-            relative_path = image_file.relative_to(folder)
-            gfx_name = f"{prefix}{relative_path.stem}"
+        for file_path, relative_path in image_files[:_PREVIEW_LIMIT]:
+            file_name = os.path.basename(file_path)
+            gfx_name = f"{prefix}{os.path.splitext(file_name)[0]}"
             if self.copy_to_mod_rb.isChecked():
-                dest_path = os.path.join(self.dest_folder_edit.text(), image_file.name).replace("\\", "/")
+                dest_path = os.path.join(self.dest_folder_edit.text(), file_name).replace("\\", "/")
                 lines.append(f"- {gfx_name} → {dest_path}")
             else:
                 lines.append(f"- {gfx_name} → {relative_path}")
 
-        if len(image_files) > 20:
-            lines.append(f"\n... 및 {len(image_files) - 20}개 더")
+        if len(image_files) > _PREVIEW_LIMIT:
+            lines.append("\n... 및 더 많은 파일")
 
         self.preview_text.setText("\n".join(lines))
 
@@ -5,12 +5,13 @@ from pathlib import Path
 
 from PIL import Image
 from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QPixmap
 from PyQt6.QtWidgets import (
     QComboBox, QDialog, QDialogButtonBox, QFileDialog, QFormLayout,
     QHBoxLayout, QLabel, QLineEdit, QPushButton,
 )
 
+from ..pixmaps import pil_to_pixmap
+
 
 class DragDropDialog(QDialog):
     """드롭된 이미지로 새 GFX를 추가할 때 이름/경로/대상 파일을 확정."""
@@ -82,19 +83,15 @@ class DragDropDialog(QDialog):
     def load_preview(self):
         try:
             with Image.open(self.image_file_path) as img:
-                if img.mode != "RGB":
-                    img = img.convert("RGB")
-                temp_path = "temp_dragdrop_preview.png"
-                img.save(temp_path, "PNG")
-                pixmap = QPixmap(temp_path)
-                scaled_pixmap = pixmap.scaled(
-                    120, 120,
-                    Qt.AspectRatioMode.KeepAspectRatio,
-                    Qt.TransformationMode.SmoothTransformation,
-                )
-                self.preview_label.setPixmap(scaled_pixmap)
-                if os.path.exists(temp_path):
-                    os.remove(temp_path)
+                # thumbnail은 JPEG이면 draft로 축소 디코드까지 하므로 원본 해상도를 다 풀지 않는다.
+                img.thumbnail((120, 120))
+                pixmap = pil_to_pixmap(img)
+            scaled_pixmap = pixmap.scaled(
+                120, 120,
+                Qt.AspectRatioMode.KeepAspectRatio,
+                Qt.TransformationMode.SmoothTransformation,
+            )
+            self.preview_label.setPixmap(scaled_pixmap)
         except Exception as e:
             self.preview_label.setText(f"미리보기 로드 실패: {e}")
 
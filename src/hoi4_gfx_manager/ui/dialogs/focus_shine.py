@@ -1,6 +1,7 @@
 """Focus GFX Shine 생성 다이얼로그."""
 
 import os
+from pathlib import PurePath
 
 from PyQt6.QtWidgets import (
     QApplication, QDialog, QFileDialog, QFormLayout, QHBoxLayout, QLabel,
@@ -22,6 +23,7 @@ class FocusShineDialog(QDialog):
         self.resize(600, 400)
         self.generator = FocusGFXShineGenerator()
         self.mod_folder_path = mod_folder_path
+        self._mod_folder_pure = PurePath(mod_folder_path) if mod_folder_path else None
 
         layout = QVBoxLayout()
         self.setLayout(layout)
@@ -81,10 +83,13 @@ class FocusShineDialog(QDialog):
         )
         if not file_path:
             return
-        if self.mod_folder_path and file_path.startswith(self.mod_folder_path):
-            line_edit.setText(os.path.relpath(file_path, self.mod_folder_path))
-        else:
-            line_edit.setText(file_path)
+        # 문자열 startswith는 구분자/대소문자 차이와 "mod"/"mod2" 같은 접두사를 구분하지 못한다.
+        if self._mod_folder_pure is not None:
+            try:
+                file_path = str(PurePath(file_path).relative_to(self._mod_folder_pure))
+            except ValueError:
+                pass
+        line_edit.setText(file_path)
 
     def browse_goals_file(self):
         self._pick_gfx_file("Goals GFX 파일 선택", self.goals_file_edit)
@@ -0,0 +1,20 @@
+"""다이얼로그가 폴더에서 파일을 고를 때 쓰는 순회 도우미."""
+
+import os
+
+
+def iter_files(folder, extensions, recursive=True):
+    """folder 아래에서 extensions로 끝나는 파일의 (전체 경로, folder 기준 상대 경로)를 내놓는다.
+
+    확장자마다 트리를 다시 훑지 않도록 os.walk 한 번으로 모든 확장자를 거른다.
+    recursive가 False면 folder 바로 아래 파일만 본다.
+    """
+    extensions = tuple(extensions)
+    for root, dirs, files in os.walk(folder):
+        rel_root = os.path.relpath(root, folder)
+        for file_name in files:
+            if file_name.lower().endswith(extensions):
+                label = file_name if rel_root == os.curdir else os.path.join(rel_root, file_name)
+                yield os.path.join(root, file_name), label
+        if not recursive:
+            dirs.clear()
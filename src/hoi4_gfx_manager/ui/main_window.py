@@ -8,13 +8,14 @@ import os
 import shutil
 import subprocess
 import sys
-from collections import Counter
+from collections import Counter, OrderedDict
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 
 from PIL import Image
 from PyQt6.QtCore import Qt, QSettings, QTimer
-from PyQt6.QtGui import QAction, QColor, QDragEnterEvent, QDropEvent, QPixmap
+from PyQt6.QtGui import QAction, QBrush, QColor, QDragEnterEvent, QDropEvent
 from PyQt6.QtWidgets import (
     QApplication, QCheckBox, QDialog, QFileDialog, QGroupBox, QHBoxLayout,
     QLabel, QLineEdit, QMainWindow, QMenu, QMessageBox, QProgressBar,
@@ -22,7 +23,7 @@ from PyQt6.QtWidgets import (
     QTreeWidget, QTreeWidgetItem, QVBoxLayout, QWidget, QInputDialog,
 )
 
-from ..services.analysis import AnalysisWorker
+from ..services.analysis import CODE_FILE_SUFFIXES, AnalysisWorker, iter_code_files
 from ..services.gfx_repository import (
     remove_gfx_from_file, save_gfx_to_file, scan_mod_folder,
     update_gfx_texture_path,
@@ -31,12 +32,53 @@ from .dialogs import (
     BatchConvertDialog, BatchImportDialog, DragDropDialog, FocusShineDialog,
     GFXEditDialog, ProjectManagerDialog,
 )
+from .pixmaps import pil_to_pixmap
 from .theme import DARK_STYLESHEET, IMAGE_EXTENSIONS, IMAGE_PLACEHOLDER_STYLE
 from .tree_widget import GFXTreeWidget
 
 _HOI4_MOD_DEFAULT = r"~\Documents\Paradox Interactive\Hearts of Iron IV\mod"
-_FILE_EXTENSIONS = ("*.txt", "*.gui", "*.mod", "*.pdx", "*.interface",
-                    "*.gfx", "*.lua", "*.yml", "*.yaml")
+_PREVIEW_CACHE_MAX = 64
+# 원본 크기 픽스맵 캐시의 총 픽셀 바이트 상한. 4096x4096 텍스처 하나가 약 64MB다.
+_DECODED_PREVIEW_BUDGET = 64 * 1024 * 1024
+
+# 파일 이름 키워드 -> 트리 유형 열 표시. 앞쪽 항목이 우선한다.
+_FILE_TYPE_KEYWORDS = (
+    ("interface", "INTERFACE"),
+    ("common", "COMMON"),
+    ("events", "EVENTS"),
+    ("decisions", "DECISIONS"),
+)
+
+# 트리 상태 열 표시: status -> (텍스트, 배경 브러시). 오류 상태가 미사용 표시보다 우선한다.
+# setBackground는 QBrush를 받으므로 QColor를 넘기면 호출마다 변환된다.
+_STATUS_DISPLAY = {
+    "missing_file": ("ERROR", QBrush(QColor(255, 200, 200))),
+    "duplicate": ("DUPLICATE", QBrush(QColor(255, 255, 200))),
+}
+_ORPHANED_DISPLAY = ("UNUSED", QBrush(QColor(200, 200, 255)))
+_VALID_DISPLAY = ("OK", None)
+
+# 메뉴바 구성: (메뉴 이름, 항목들). 항목은 (액션 이름, 슬롯 메서드 이름) 또는 구분선 None.
+_MENU_SPEC = (
+    ("파일", (
+        ("모드 폴더 열기", "open_mod_folder"),
+        None,
+        ("분석 결과 내보내기", "export_analysis"),
+    )),
+    ("편집", (
+        ("새 GFX 추가", "add_gfx"),
+        ("일괄 임포트", "batch_import"),
+    )),
+    ("도구", (
+        ("전체 분석 실행", "run_full_analysis"),
+        None,
+        ("Focus GFX Shine 생성", "open_focus_shine_generator"),
+        ("GFX 일괄 변환", "open_batch_converter"),
+    )),
+    ("보기", (
+        ("다크 모드 전환", "_toggle_theme"),
+    )),
+)
 
 
 class GFXManager(QMainWindow):
@@ -52,6 +94,19 @@ class GFXManager(QMainWindow):
         self.used_gfx = set()
         self.usage_locations = {}
         self.analysis_worker = None
+        # (텍스처 경로, mtime_ns, 너비, 높이) -> 축소된 미리보기 QPixmap
+        self._preview_cache = OrderedDict()
+        # 텍스처 경로 -> (mtime_ns, 원본 크기 QPixmap, 픽셀 바이트)
+        self._decoded_previews = OrderedDict()
+        self._decoded_preview_bytes = 0
+        # .gfx 전체 경로 -> 트리/리포트 표시용 basename
+        self._file_labels = {}
+        # GFX 이름 -> 소문자 이름 (검색 필터용)
+        self._lower_names = {}
+        # 마지막 스캔에서 찾은 .gfx 파일 목록
+        self._gfx_files = []
+        # [(파일 표시 이름, .gfx 전체 경로, 정렬된 GFX 이름 목록)], 파일 이름순
+        self._sprites_by_file = []
 
         self.settings = QSettings("HOI4GFXManager", "Settings")
         self.projects = self._load_projects()
@@ -115,40 +170,16 @@ class GFXManager(QMainWindow):
 
     def _create_menus(self):
         menubar = self.menuBar()
-
-        file_menu = menubar.addMenu("파일")
-        open_action = QAction("모드 폴더 열기", self)
-        open_action.triggered.connect(self.open_mod_folder)
-        file_menu.addAction(open_action)
-        file_menu.addSeparator()
-        export_action = QAction("분석 결과 내보내기", self)
-        export_action.triggered.connect(self.export_analysis)
-        file_menu.addAction(export_action)
-
-        edit_menu = menubar.addMenu("편집")
-        add_gfx_action = QAction("새 GFX 추가", self)
-        add_gfx_action.triggered.connect(self.add_gfx)
-        edit_menu.addAction(add_gfx_action)
-        batch_import_action = QAction("일괄 임포트", self)
-        batch_import_action.triggered.connect(self.batch_import)
-        edit_menu.addAction(batch_import_action)
-
-        tools_menu = menubar.addMenu("도구")
-        analyze_action = QAction("전체 분석 실행", self)
-        analyze_action.triggered.connect(self.run_full_analysis)
-        tools_menu.addAction(analyze_action)
-        tools_menu.addSeparator()
-        focus_shine_action = QAction("Focus GFX Shine 생성", self)
-        focus_shine_action.triggered.connect(self.open_focus_shine_generator)
-        tools_menu.addAction(focus_shine_action)
-        batch_convert_action = QAction("GFX 일괄 변환", self)
-        batch_convert_action.triggered.connect(self.open_batch_converter)
-        tools_menu.addAction(batch_convert_action)
-
-        view_menu = menubar.addMenu("보기")
-        theme_action = QAction("다크 모드 전환", self)
-        theme_action.triggered.connect(self._toggle_theme)
-        view_menu.addAction(theme_action)
+        for menu_name, items in _MENU_SPEC:
+            menu = menubar.addMenu(menu_name)
+            for item in items:
+                if item is None:
+                    menu.addSeparator()
+                    continue
+                label, slot_name = item
+                action = QAction(label, self)
+                action.triggered.connect(getattr(self, slot_name))
+                menu.addAction(action)
 
     def _create_toolbar(self):
         toolbar = QToolBar()
@@ -317,6 +348,7 @@ class GFXManager(QMainWindow):
             return
 
         self.gfx_tree.clear()
+        self._gfx_files = []
 
         try:
             gfx_data, duplicates, gfx_files = scan_mod_folder(self.mod_folder_path)
@@ -324,13 +356,31 @@ class GFXManager(QMainWindow):
             QMessageBox.critical(self, "오류", f"GFX 파일 스캔 중 오류: {e}")
             return
 
+        self._gfx_files = gfx_files
         if not gfx_files:
             QMessageBox.information(self, "알림", "선택한 폴더에서 .gfx 파일을 찾을 수 없습니다.")
             self.gfx_data = {}
+            self._sprites_by_file = []
             return
 
         self.gfx_data = gfx_data
         self.duplicate_definitions = duplicates
+        # 트리/리포트에 표시할 파일 이름은 .gfx 파일마다 한 번만 계산한다.
+        self._file_labels = {}
+        names_by_file = {}
+        for name, info in gfx_data.items():
+            file_source = info["file_source"]
+            if file_source not in self._file_labels:
+                self._file_labels[file_source] = os.path.basename(file_source)
+            names_by_file.setdefault(file_source, []).append(name)
+        # 트리 재구성은 검색/필터 변경마다 일어나므로 파일별 묶음과 정렬을 미리 해 둔다.
+        # 이름이 같은 .gfx가 다른 폴더에 있어도 합치지 않도록 전체 경로로 묶는다.
+        self._sprites_by_file = sorted(
+            (self._file_labels[file_source], file_source, sorted(names))
+            for file_source, names in names_by_file.items()
+        )
+        # 검색 필터는 키 입력마다 돌므로 소문자 이름을 스캔 때 한 번만 만든다.
+        self._lower_names = {name: name.lower() for name in gfx_data}
 
         self._update_gfx_list()
         self._update_statistics_cards()
@@ -341,78 +391,86 @@ class GFXManager(QMainWindow):
     # ----- 트리 렌더링 -----
 
     def _update_gfx_list(self):
-        self.gfx_tree.clear()
         search_text = self.search_field.text().lower()
 
-        file_groups = {}
-        for name, info in self.gfx_data.items():
-            if search_text and search_text not in name.lower():
-                continue
-
-            status = info["status"]
-            if status == "valid" and not self.show_valid_cb.isChecked():
-                continue
-            if status == "missing_file" and not self.show_missing_cb.isChecked():
-                continue
-            if status == "duplicate" and not self.show_duplicate_cb.isChecked():
-                continue
-            if name in self.orphaned_gfx and not self.show_orphaned_cb.isChecked():
-                continue
-
-            file_source = os.path.basename(info["file_source"])
-            file_groups.setdefault(file_source, []).append((name, info))
-
-        for file_source in sorted(file_groups):
-            file_type = self._infer_file_type(file_source)
-            file_item = QTreeWidgetItem([file_source, "", "", file_type])
-            file_item.setExpanded(True)
-
-            for name, info in sorted(file_groups[file_source]):
-                status = info["status"]
-                if status == "missing_file":
-                    status_text = "ERROR"
-                elif status == "duplicate":
-                    status_text = "DUPLICATE"
-                elif name in self.orphaned_gfx:
-                    status_text = "UNUSED"
-                else:
-                    status_text = "OK"
-
-                gfx_item = QTreeWidgetItem([name, status_text, info["relative_path"], "GFX"])
+        # 체크박스 상태는 루프 동안 바뀌지 않으므로 한 번만 읽는다.
+        hidden_statuses = {
+            status
+            for status, checkbox in (
+                ("valid", self.show_valid_cb),
+                ("missing_file", self.show_missing_cb),
+                ("duplicate", self.show_duplicate_cb),
+            )
+            if not checkbox.isChecked()
+        }
+        orphaned_gfx = self.orphaned_gfx
+        hide_orphaned = not self.show_orphaned_cb.isChecked()
+
+        gfx_data = self.gfx_data
+        lower_names = self._lower_names
+        file_groups = []
+        for file_label, file_source, names in self._sprites_by_file:
+            rows = []
+            for name in names:
+                info = gfx_data[name]
+                if search_text and search_text not in lower_names[name]:
+                    continue
+                if info["status"] in hidden_statuses:
+                    continue
+                if hide_orphaned and name in orphaned_gfx:
+                    continue
+                rows.append((name, info))
+            if rows:
+                file_groups.append((file_label, file_source, rows))
+
+        # 항목 추가/펼치기/열 폭 계산마다 다시 그리지 않도록 갱신을 한 번으로 묶는다.
+        self.gfx_tree.setUpdatesEnabled(False)
+        try:
+            self._fill_gfx_tree(file_groups, orphaned_gfx)
+        finally:
+            self.gfx_tree.setUpdatesEnabled(True)
 
-                if status == "missing_file":
-                    color = QColor(255, 200, 200)
-                elif status == "duplicate":
-                    color = QColor(255, 255, 200)
-                elif name in self.orphaned_gfx:
-                    color = QColor(200, 200, 255)
-                else:
-                    color = None
+    def _fill_gfx_tree(self, file_groups, orphaned_gfx):
+        self.gfx_tree.clear()
+        # 아이템을 모두 만든 뒤 addChildren/addTopLevelItems로 한 번에 붙여
+        # 항목마다 모델 삽입 신호가 나가지 않게 한다.
+        file_items = []
+        for file_label, file_source, rows in file_groups:
+            file_type = self._infer_file_type(file_label)
+            file_item = QTreeWidgetItem([file_label, "", "", file_type])
+            # 표시 이름은 basename뿐이므로 드롭 대상 파일은 노드에 실은 전체 경로로 찾는다.
+            file_item.setData(0, Qt.ItemDataRole.UserRole, file_source)
+
+            gfx_items = []
+            for name, info in rows:
+                display = _STATUS_DISPLAY.get(info["status"])
+                if display is None:
+                    display = _ORPHANED_DISPLAY if name in orphaned_gfx else _VALID_DISPLAY
+                status_text, brush = display
 
-                if color is not None:
-                    gfx_item.setBackground(0, color)
-                    gfx_item.setBackground(1, color)
+                gfx_item = QTreeWidgetItem([name, status_text, info["relative_path"], "GFX"])
+                if brush is not None:
+                    gfx_item.setBackground(0, brush)
+                    gfx_item.setBackground(1, brush)
 
-                file_item.addChild(gfx_item)
+                gfx_items.append(gfx_item)
 
-            self.gfx_tree.addTopLevelItem(file_item)
+            file_item.addChildren(gfx_items)
+            file_items.append(file_item)
 
+        self.gfx_tree.addTopLevelItems(file_items)
         self.gfx_tree.expandAll()
         for col in range(4):
             self.gfx_tree.resizeColumnToContents(col)
 
     @staticmethod
+    @lru_cache(maxsize=1024)
     def _infer_file_type(file_source):
         lower = file_source.lower()
-        if "interface" in lower:
-            return "INTERFACE"
-        if "common" in lower:
-            return "COMMON"
-        if "events" in lower:
-            return "EVENTS"
-        if "decisions" in lower:
-            return "DECISIONS"
-        return "FILE"
+        return next(
+            (file_type for keyword, file_type in _FILE_TYPE_KEYWORDS if keyword in lower),
+            "FILE",
+        )
 
     def _filter_gfx_list(self):
         self._update_gfx_list()
@@ -459,25 +517,57 @@ class GFXManager(QMainWindow):
             return
 
         try:
-            with Image.open(texture_path) as img:
-                if img.mode != "RGB":
-                    img = img.convert("RGB")
-                temp_path = "temp_preview.png"
-                img.save(temp_path, "PNG")
-                pixmap = QPixmap(temp_path)
-                label_size = self.image_label.size()
-                scaled_pixmap = pixmap.scaled(
-                    label_size.width() - 10,
-                    label_size.height() - 10,
-                    Qt.AspectRatioMode.KeepAspectRatio,
-                    Qt.TransformationMode.SmoothTransformation,
-                )
-                self.image_label.setPixmap(scaled_pixmap)
-                if os.path.exists(temp_path):
-                    os.remove(temp_path)
+            label_size = self.image_label.size()
+            self.image_label.setPixmap(self._scaled_preview(
+                texture_path, label_size.width() - 10, label_size.height() - 10
+            ))
         except Exception as e:
             self.image_label.setText(f"이미지를 불러올 수 없습니다:\n{e}")
 
+    def _scaled_preview(self, texture_path, width, height):
+        """미리보기 라벨 크기로 축소한 픽스맵. 같은 파일/크기는 캐시에서 꺼낸다."""
+        mtime_ns = os.stat(texture_path).st_mtime_ns
+        key = (texture_path, mtime_ns, width, height)
+        cached = self._preview_cache.get(key)
+        if cached is not None:
+            self._preview_cache.move_to_end(key)
+            return cached
+
+        scaled_pixmap = self._decoded_preview(texture_path, mtime_ns).scaled(
+            width,
+            height,
+            Qt.AspectRatioMode.KeepAspectRatio,
+            Qt.TransformationMode.SmoothTransformation,
+        )
+        self._preview_cache[key] = scaled_pixmap
+        if len(self._preview_cache) > _PREVIEW_CACHE_MAX:
+            self._preview_cache.popitem(last=False)
+        return scaled_pixmap
+
+    def _decoded_preview(self, texture_path, mtime_ns):
+        """원본 크기로 디코딩한 픽스맵. 파일이 바뀌지 않았으면 다시 디코딩하지 않는다."""
+        cached = self._decoded_previews.get(texture_path)
+        if cached is not None and cached[0] == mtime_ns:
+            self._decoded_previews.move_to_end(texture_path)
+            return cached[1]
+
+        with Image.open(texture_path) as img:
+            pixmap = pil_to_pixmap(img)
+
+        # 원본 크기 픽스맵은 크므로 개수가 아니라 픽셀 바이트 합으로 제한하고,
+        # 상한을 넘으면 오래 안 본 것부터 버린다. 상한보다 큰 이미지는 캐시하지 않는다.
+        stale = self._decoded_previews.pop(texture_path, None)
+        if stale is not None:
+            self._decoded_preview_bytes -= stale[2]
+        cost = pixmap.width() * pixmap.height() * 4
+        if cost <= _DECODED_PREVIEW_BUDGET:
+            self._decoded_previews[texture_path] = (mtime_ns, pixmap, cost)
+            self._decoded_preview_bytes += cost
+            while self._decoded_preview_bytes > _DECODED_PREVIEW_BUDGET:
+                _, (_, _, evicted_cost) = self._decoded_previews.popitem(last=False)
+                self._decoded_preview_bytes -= evicted_cost
+        return pixmap
+
     # ----- 분석 -----
 
     def run_full_analysis(self):
@@ -509,8 +599,9 @@ class GFXManager(QMainWindow):
 
     def _update_statistics_cards(self):
         total = len(self.gfx_data)
-        valid = sum(1 for info in self.gfx_data.values() if info["status"] == "valid")
-        error = sum(1 for info in self.gfx_data.values() if info["status"] in ("missing_file", "duplicate"))
+        status_counts = Counter(info["status"] for info in self.gfx_data.values())
+        valid = status_counts["valid"]
+        error = status_counts["missing_file"] + status_counts["duplicate"]
         orphaned = len(self.orphaned_gfx)
 
         self.total_gfx_label.setText(f"총 GFX: {total}개")
@@ -519,10 +610,7 @@ class GFXManager(QMainWindow):
         self.orphaned_gfx_label.setText(f"미사용: {orphaned}개")
 
     def _count_code_files(self):
-        total = 0
-        for ext in _FILE_EXTENSIONS:
-            total += sum(1 for _ in Path(self.mod_folder_path).rglob(ext))
-        return total
+        return sum(1 for _ in iter_code_files(self.mod_folder_path))
 
     def _generate_analysis_report(self, results):
         parts = []
@@ -530,26 +618,25 @@ class GFXManager(QMainWindow):
         parts.append(f"분석 일시: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         parts.append(f"모드 경로: {self.mod_folder_path}")
 
-        code_files_count = results.get("code_files_count", self._count_code_files())
+        code_files_count = results.get("code_files_count")
+        if code_files_count is None:
+            code_files_count = self._count_code_files()
         parts.append(f"검사된 파일: {code_files_count}개")
-        parts.append(
-            "검사 파일 형식: "
-            + ", ".join(ext.replace("*", "") for ext in _FILE_EXTENSIONS)
-            + "\n"
-        )
+        parts.append("검사 파일 형식: " + ", ".join(CODE_FILE_SUFFIXES) + "\n")
 
+        # 파일별 통계와 전체 정상/오류 개수를 한 번의 순회로 모은다.
         file_stats = {}
+        valid_gfx = 0
         for info in self.gfx_data.values():
-            key = os.path.basename(info["file_source"])
+            key = self._file_labels[info["file_source"]]
             stats = file_stats.setdefault(key, {"total": 0, "valid": 0, "error": 0})
             stats["total"] += 1
             if info["status"] == "valid":
                 stats["valid"] += 1
+                valid_gfx += 1
             else:
                 stats["error"] += 1
-
-        valid_gfx = sum(1 for info in self.gfx_data.values() if info["status"] == "valid")
-        invalid_gfx = sum(1 for info in self.gfx_data.values() if info["status"] != "valid")
+        invalid_gfx = len(self.gfx_data) - valid_gfx
         usage_rate = (len(self.used_gfx) / len(self.gfx_data) * 100) if self.gfx_data else 0
 
         parts.append("=== 전체 통계 ===")
@@ -582,7 +669,7 @@ class GFXManager(QMainWindow):
             orphaned_by_file = {}
             for gfx in self.orphaned_gfx:
                 if gfx in self.gfx_data:
-                    key = os.path.basename(self.gfx_data[gfx]["file_source"])
+                    key = self._file_labels[self.gfx_data[gfx]["file_source"]]
                     orphaned_by_file.setdefault(key, []).append(gfx)
             for file_name, gfx_list in sorted(orphaned_by_file.items()):
                 parts.append(f"[{file_name}] ({len(gfx_list)}개):")
@@ -656,10 +743,20 @@ class GFXManager(QMainWindow):
         open_texture_action.triggered.connect(self._open_texture_folder)
         menu.exec(self.gfx_tree.mapToGlobal(position))
 
+    def _known_gfx_files(self):
+        # 마지막 스캔 결과를 재사용한다. 편집 후에는 항상 다시 스캔하므로 최신 상태다.
+        if self._gfx_files:
+            return self._gfx_files
+        return list(Path(self.mod_folder_path).rglob("*.gfx"))
+
+    def _relative_gfx_paths(self, gfx_files):
+        # 스캔 결과는 모두 모드 폴더 아래 경로이므로 relpath의 정규화 없이 접두부만 떼어낸다.
+        root = Path(self.mod_folder_path)
+        return [str(gfx_file.relative_to(root)) for gfx_file in gfx_files]
+
     def _populate_gfx_file_combo(self, combo):
-        gfx_files = list(Path(self.mod_folder_path).rglob("*.gfx"))
-        relative_paths = [os.path.relpath(str(f), self.mod_folder_path) for f in gfx_files]
-        combo.addItems(relative_paths)
+        gfx_files = self._known_gfx_files()
+        combo.addItems(self._relative_gfx_paths(gfx_files))
         return gfx_files
 
     def add_gfx(self):
@@ -957,13 +1054,13 @@ class GFXManager(QMainWindow):
             event.ignore()
 
     def _process_dropped_images(self, image_files):
-        gfx_files = list(Path(self.mod_folder_path).rglob("*.gfx"))
+        gfx_files = self._known_gfx_files()
         if not gfx_files:
             QMessageBox.warning(self, "경고", "프로젝트에서 .gfx 파일을 찾을 수 없습니다.")
             return
 
         success_count = 0
-        relative_paths = [os.path.relpath(str(f), self.mod_folder_path) for f in gfx_files]
+        relative_paths = self._relative_gfx_paths(gfx_files)
 
         for image_file in image_files:
             dialog = DragDropDialog(self, image_file)
@@ -1019,11 +1116,7 @@ class GFXManager(QMainWindow):
                 self._handle_new_gfx_auto(file_path, target_item)
 
     def _resolve_gfx_file_for_file_item(self, file_item):
-        file_source = file_item.text(0)
-        for info in self.gfx_data.values():
-            if info["file_source"] == file_source:
-                return info["file_source"]
-        return None
+        return file_item.data(0, Qt.ItemDataRole.UserRole)
 
     def _handle_new_gfx_manual(self, file_path, file_item):
         gfx_file_path = self._resolve_gfx_file_for_file_item(file_item)
@@ -1145,12 +1238,16 @@ class GFXManager(QMainWindow):
     # ----- 상태바 -----
 
     def _update_status(self):
+        # 1초 타이머로 불리므로 창이 안 보이거나 문구가 같으면 다시 그리지 않는다.
+        if self.isMinimized() or not self.isVisible():
+            return
         if self.mod_folder_path:
             status_text = (
                 f"GFX: {len(self.gfx_data)}개 | "
                 f"미사용: {len(self.orphaned_gfx)}개 | "
                 f"누락: {len(self.missing_definitions)}개 | 드래그 앤 드롭 지원"
             )
-            self.status_bar.showMessage(status_text)
         else:
-            self.status_bar.showMessage("모드 폴더를 선택해주세요")
+            status_text = "모드 폴더를 선택해주세요"
+        if self.status_bar.currentMessage() != status_text:
+            self.status_bar.showMessage(status_text)
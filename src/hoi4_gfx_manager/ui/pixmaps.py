@@ -0,0 +1,16 @@
+"""PIL 이미지 -> QPixmap 변환 도우미."""
+
+from PyQt6.QtGui import QImage, QPixmap
+
+
+def pil_to_pixmap(img):
+    """PIL 이미지를 임시 PNG 파일 없이 메모리에서 QPixmap으로 바꾼다.
+
+    알파는 버리고 RGB로 표시한다 (기존 미리보기와 동일).
+    """
+    if img.mode != "RGB":
+        img = img.convert("RGB")
+    data = img.tobytes("raw", "RGB")
+    qimage = QImage(data, img.width, img.height, img.width * 3, QImage.Format.Format_RGB888)
+    # QImage는 data 버퍼를 빌려 쓰므로, 버퍼가 사라지기 전에 copy()로 소유한다.
+    return QPixmap.fromImage(qimage.copy())
@@ -0,0 +1,120 @@
+import importlib
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+# `python -m unittest tests.test_analysis`처럼 점 경로로 돌려도 스텁 헬퍼를 찾도록 tests/를 넣는다.
+# src/ 경로는 test_dds_conversion이 import될 때 추가한다.
+_TESTS_PATH = os.path.dirname(os.path.abspath(__file__))
+if _TESTS_PATH not in sys.path:
+    sys.path.insert(0, _TESTS_PATH)
+
+from test_dds_conversion import ensure_dependency_stubs
+
+ensure_dependency_stubs()
+analysis = importlib.import_module("hoi4_gfx_manager.services.analysis")
+code_scan = importlib.import_module("hoi4_gfx_manager.services.code_scan")
+
+
+class AnalyzeModFolderTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.mod_folder = self.temp_dir.name
+        self.gfx_file = os.path.join(self.mod_folder, "interface", "goals.gfx")
+        self.gfx_data = {
+            name: {"file_source": self.gfx_file, "status": "valid"}
+            for name in ("GFX_goal_used", "GFX_goal_used_shine", "GFX_goal_commented", "GFX_goal_self")
+        }
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def write(self, relative_path, content):
+        path = os.path.join(self.mod_folder, relative_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as code_file:
+            code_file.write(content)
+        return path
+
+    def test_classifies_used_and_orphaned_sprites(self):
+        self.write("interface/goals.gfx", 'spriteType = { name = "GFX_goal_self" }\n')
+        focus_file = self.write(
+            "common/national_focus/focus.txt",
+            'focus = {\n'
+            '\ticon = GFX_goal_used\n'
+            '\t# icon = GFX_goal_commented\n'
+            '}\n',
+        )
+        self.write("common/ideas/plain.txt", "idea = { cost = 10 }\n")
+
+        results = analysis.analyze_mod_folder(self.mod_folder, self.gfx_data)
+
+        self.assertEqual(results["used_gfx"], {"GFX_goal_used"})
+        self.assertEqual(results["orphaned_gfx"], {"GFX_goal_commented", "GFX_goal_self"})
+        self.assertEqual(results["usage_locations"]["GFX_goal_used"], [focus_file])
+        self.assertEqual(results["usage_locations"]["GFX_goal_used_shine"], [focus_file])
+        self.assertEqual(results["code_files_count"], 3)
+
+    def test_reports_progress_up_to_completion(self):
+        self.write("common/ideas/plain.txt", "idea = { cost = 10 }\n")
+        progress = []
+
+        analysis.analyze_mod_folder(self.mod_folder, self.gfx_data, progress.append)
+
+        self.assertEqual(progress[-1], 100)
+        self.assertEqual(progress, sorted(progress))
+
+    def test_collects_code_files_in_one_walk_by_suffix(self):
+        self.write("common/ideas/plain.txt", "")
+        self.write("interface/UPPER.GUI", "")
+        self.write("gfx/interface/goal.png", "")
+        self.write("common/readme.txt.bak", "")
+
+        files = {os.path.relpath(path, self.mod_folder) for path in analysis.iter_code_files(self.mod_folder)}
+
+        self.assertEqual(files, {os.path.join("common", "ideas", "plain.txt"), os.path.join("interface", "UPPER.GUI")})
+
+    def test_parallel_scan_matches_serial_scan(self):
+        self.write("interface/goals.gfx", 'spriteType = { name = "GFX_goal_self" }\n')
+        for index in range(6):
+            self.write(f"common/national_focus/focus_{index}.txt", "focus = { icon = GFX_goal_used }\n")
+        self.write("common/ideas/plain.txt", "idea = { cost = 10 }\n")
+
+        serial = analysis.analyze_mod_folder(self.mod_folder, self.gfx_data)
+        pools = []
+
+        def record_pool(*args, **kwargs):
+            pools.append(kwargs)
+            return real_pool(*args, **kwargs)
+
+        real_pool = code_scan.ProcessPoolExecutor
+        with mock.patch.object(code_scan, "_PARALLEL_MIN_FILES", 1), \
+                mock.patch.object(code_scan, "_SCAN_CHUNKSIZE", 1), \
+                mock.patch.object(code_scan.os, "cpu_count", return_value=2), \
+                mock.patch.object(code_scan, "ProcessPoolExecutor", side_effect=record_pool), \
+                mock.patch.object(code_scan, "_scan_file", wraps=code_scan._scan_file) as in_process_scan:
+            parallel = analysis.analyze_mod_folder(self.mod_folder, self.gfx_data)
+
+        self.assertEqual(parallel, serial)
+        self.assertEqual(len(parallel["usage_locations"]["GFX_goal_used"]), 6)
+        # 풀이 실제로 돌았고 현재 프로세스의 순차 검사로 빠지지 않았다.
+        self.assertEqual(len(pools), 1)
+        self.assertEqual(pools[0]["max_workers"], 2)
+        self.assertEqual(pools[0]["mp_context"].get_start_method(), "spawn")
+        in_process_scan.assert_not_called()
+
+
+class StripLineCommentsTests(unittest.TestCase):
+    def test_keeps_hash_inside_strings(self):
+        content = 'a = "x # y" # note\nb = \'#\' c # tail\nd = "open # rest\n# whole line'
+
+        self.assertEqual(
+            code_scan._strip_line_comments(content),
+            'a = "x # y" \nb = \'#\' c \nd = "open # rest\n',
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,6 +2,7 @@ import importlib
 import os
 import sys
 import tempfile
+import threading
 import types
 import unittest
 from unittest import mock
@@ -59,7 +60,7 @@ def ensure_dependency_stubs():
         cv2_module = types.ModuleType("cv2")
         cv2_module.COLOR_RGBA2BGRA = "rgba2bgra"
         cv2_module.COLOR_RGB2BGR = "rgb2bgr"
-        cv2_module.cvtColor = lambda image, code: image
+        cv2_module.cvtColor = lambda image, code, dst=None: image
         cv2_module.imwrite = lambda path, data: False
         sys.modules["cv2"] = cv2_module
 
@@ -94,8 +95,9 @@ main = importlib.import_module("hoi4_gfx_manager.services.image_conversion")
 
 
 class FakeImage:
-    def __init__(self, mode="RGBA"):
+    def __init__(self, mode="RGBA", format=None):
         self.mode = mode
+        self.format = format
         self.info = {}
 
     def convert(self, mode):
@@ -119,6 +121,10 @@ class ImageConverterDDSTests(unittest.TestCase):
         self.image = FakeImage()
         self.temp_dir = tempfile.TemporaryDirectory()
         self.output_path = os.path.join(self.temp_dir.name, "sample.dds")
+        # 아래 테스트는 OpenCV 경로를 고정한다. Pillow 경로는 PillowDDSWriterTests에서 다룬다.
+        writer_patch = mock.patch.object(main, "_HAS_PILLOW_DDS_WRITER", False)
+        writer_patch.start()
+        self.addCleanup(writer_patch.stop)
 
     def tearDown(self):
         self.temp_dir.cleanup()
@@ -132,6 +138,23 @@ class ImageConverterDDSTests(unittest.TestCase):
 
         self.assertFalse(os.path.exists(self.output_path))
 
+    def test_save_as_dds_swaps_channels_in_place(self):
+        pixels = object()
+        written = []
+
+        def record_write(path, data):
+            written.append(data)
+            return False
+
+        with mock.patch.object(main.np, "array", return_value=pixels), \
+             mock.patch.object(main.cv2, "cvtColor", return_value=pixels) as cvt_color, \
+             mock.patch.object(main.cv2, "imwrite", side_effect=record_write):
+            with self.assertRaises(RuntimeError):
+                self.converter._save_as_dds(self.image, self.output_path, "RGBA")
+
+        cvt_color.assert_called_once_with(pixels, main.cv2.COLOR_RGBA2BGRA, dst=pixels)
+        self.assertIs(written[0], pixels)
+
     def test_save_as_dds_rejects_non_dds_payload(self):
         def write_fake_png(path, data):
             with open(path, "wb") as output_file:
@@ -175,5 +198,220 @@ class ImageConverterDDSTests(unittest.TestCase):
         self.assertFalse(os.path.exists(self.output_path))
 
 
+class PillowDDSWriterTests(unittest.TestCase):
+    def setUp(self):
+        self.converter = main.ImageConverter()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.output_path = os.path.join(self.temp_dir.name, "sample.dds")
+        writer_patch = mock.patch.object(main, "_HAS_PILLOW_DDS_WRITER", True)
+        writer_patch.start()
+        self.addCleanup(writer_patch.stop)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def make_image(self, payload):
+        image = FakeImage()
+        saved = []
+
+        def save(path, format=None, **kwargs):
+            saved.append((format, kwargs))
+            with open(path, "wb") as output_file:
+                output_file.write(payload)
+
+        image.save = save
+        return image, saved
+
+    def test_compressed_formats_use_pillow_pixel_format(self):
+        image, saved = self.make_image(main.ImageConverter.DDS_MAGIC + b"payload")
+
+        with mock.patch.object(main.cv2, "imwrite") as imwrite:
+            self.converter._save_as_dds(image, self.output_path, "DXT5")
+
+        self.assertEqual(saved, [("DDS", {"pixel_format": "DXT5"})])
+        imwrite.assert_not_called()
+
+    def test_modes_pillow_cannot_write_are_converted_before_compression(self):
+        converted, saved = self.make_image(main.ImageConverter.DDS_MAGIC + b"payload")
+        converted.mode = "RGB"
+        palette_image = FakeImage(mode="P")
+        requested_modes = []
+
+        def convert(mode):
+            requested_modes.append(mode)
+            return converted
+
+        palette_image.convert = convert
+
+        self.converter._save_as_dds(palette_image, self.output_path, "DXT1")
+
+        self.assertEqual(requested_modes, ["RGB"])
+        self.assertEqual(saved, [("DDS", {"pixel_format": "DXT1"})])
+
+    def test_pillow_output_still_requires_dds_magic(self):
+        image, _ = self.make_image(b"\x89PNGfake")
+
+        with self.assertRaisesRegex(RuntimeError, "non-DDS data"):
+            self.converter._save_as_dds(image, self.output_path, "RGBA")
+
+        self.assertFalse(os.path.exists(self.output_path))
+
+    def test_formats_no_encoder_can_write_are_rejected_up_front(self):
+        image, saved = self.make_image(b"")
+
+        with mock.patch.object(main.cv2, "imwrite") as imwrite:
+            with self.assertRaisesRegex(RuntimeError, "'BC7' is not supported"):
+                self.converter._save_as_dds(image, self.output_path, "BC7")
+
+        self.assertEqual(saved, [])
+        imwrite.assert_not_called()
+        self.assertFalse(os.path.exists(self.output_path))
+        self.assertNotIn("BC7", main.ImageConverter.DDS_FORMATS.values())
+
+
+class ConvertImageCopyTests(unittest.TestCase):
+    def setUp(self):
+        self.converter = main.ImageConverter()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.input_path = os.path.join(self.temp_dir.name, "icon.PNG")
+        with open(self.input_path, "wb") as input_file:
+            input_file.write(b"\x89PNGpayload")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def open_as(self, image_format):
+        image = FakeImage(mode="RGB", format=image_format)
+        saved = []
+        image.save = lambda path, format=None, **kwargs: saved.append(format)
+        return mock.patch.object(main.Image, "open", return_value=FakeImageContext(image)), saved
+
+    def test_same_lossless_format_is_copied_without_decoding(self):
+        output_path = os.path.join(self.temp_dir.name, "out.png")
+        image_open, saved = self.open_as("PNG")
+
+        with image_open:
+            success, error = self.converter.convert_image(self.input_path, output_path, "PNG")
+
+        self.assertEqual((success, error), (True, None))
+        self.assertEqual(saved, [])
+        with open(output_path, "rb") as output_file:
+            self.assertEqual(output_file.read(), b"\x89PNGpayload")
+
+    def test_converting_onto_itself_leaves_the_file_alone(self):
+        image_open, _ = self.open_as("PNG")
+
+        with image_open:
+            success, error = self.converter.convert_image(self.input_path, self.input_path, "PNG")
+
+        self.assertEqual((success, error), (True, None))
+
+    def test_content_in_another_format_is_reencoded(self):
+        output_path = os.path.join(self.temp_dir.name, "out.png")
+        image_open, saved = self.open_as("JPEG")
+
+        with image_open:
+            success, error = self.converter.convert_image(self.input_path, output_path, "PNG")
+
+        self.assertEqual((success, error), (True, None))
+        self.assertEqual(saved, ["PNG"])
+
+    def test_unreadable_file_is_not_copied(self):
+        output_path = os.path.join(self.temp_dir.name, "out.png")
+
+        with mock.patch.object(main.Image, "open", side_effect=OSError("cannot identify image file")):
+            success, error = self.converter.convert_image(self.input_path, output_path, "PNG")
+
+        self.assertFalse(success)
+        self.assertIn("cannot identify", error)
+        self.assertFalse(os.path.exists(output_path))
+
+    def test_other_formats_are_reencoded(self):
+        output_path = os.path.join(self.temp_dir.name, "out.bmp")
+
+        with mock.patch.object(main.Image, "open", side_effect=OSError("decoder")) as image_open:
+            success, error = self.converter.convert_image(self.input_path, output_path, "BMP")
+
+        self.assertFalse(success)
+        self.assertIn("decoder", error)
+        image_open.assert_called_once()
+
+
+class BatchConvertTests(unittest.TestCase):
+    def test_keeps_input_order_and_reports_progress(self):
+        converter = main.ImageConverter()
+        calls = []
+
+        def fake_convert(input_path, output_path, *args):
+            calls.append((input_path, output_path))
+            if input_path.endswith("bad.png"):
+                return False, "broken"
+            return True, None
+
+        progress = []
+        streamed = []
+        inputs = [os.path.join("in", f"{name}.png") for name in ("c", "bad", "a", "b")]
+        with mock.patch.object(converter, "convert_image", side_effect=fake_convert):
+            results = converter.batch_convert(
+                inputs, "out", output_format="DDS",
+                progress_callback=lambda done, total: progress.append((done, total)),
+                result_callback=streamed.append,
+            )
+
+        self.assertEqual([result.input for result in results], inputs)
+        self.assertEqual(
+            [result.output for result in results],
+            [os.path.join("out", f"{name}.dds") for name in ("c", "bad", "a", "b")],
+        )
+        self.assertEqual([result.success for result in results], [True, False, True, True])
+        self.assertEqual(results[1].error, "broken")
+        self.assertEqual(len(calls), 4)
+        self.assertEqual(progress[-1], (4, 4))
+        self.assertCountEqual(streamed, results)
+
+    def test_inputs_sharing_an_output_name_are_written_in_order(self):
+        converter = main.ImageConverter()
+        calls = []
+
+        def fake_convert(input_path, output_path, *args):
+            calls.append(input_path)
+            return True, None
+
+        inputs = [os.path.join("one", "icon.png"), os.path.join("two", "icon.tga")]
+        with mock.patch.object(converter, "convert_image", side_effect=fake_convert):
+            converter.batch_convert(inputs, "out", output_format="PNG")
+
+        self.assertEqual(calls, inputs)
+
+    def test_cancelled_batch_skips_files_that_have_not_started(self):
+        converter = main.ImageConverter()
+        cancel_event = threading.Event()
+        calls = []
+
+        def fake_convert(input_path, output_path, *args):
+            calls.append(input_path)
+            cancel_event.set()
+            return True, None
+
+        # 출력 이름이 같으면 한 작업에서 순서대로 처리되므로 취소 시점이 결정적이다.
+        inputs = [os.path.join("one", "icon.png"), os.path.join("two", "icon.png")]
+        with mock.patch.object(converter, "convert_image", side_effect=fake_convert):
+            results = converter.batch_convert(inputs, "out", cancel_event=cancel_event)
+
+        self.assertEqual(calls, inputs[:1])
+        self.assertTrue(results[0].success)
+        self.assertEqual((results[1].success, results[1].error), (False, "cancelled"))
+
+    def test_reports_unusable_entries_without_stopping_the_batch(self):
+        converter = main.ImageConverter()
+
+        with mock.patch.object(converter, "convert_image", return_value=(True, None)):
+            results = converter.batch_convert([None, "a.png"], "out")
+
+        self.assertFalse(results[0].success)
+        self.assertEqual(results[0].output, "")
+        self.assertEqual(results[1].output, os.path.join("out", "a.png"))
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,118 @@
+import importlib
+import os
+import sys
+import tempfile
+import unittest
+
+# test_analysis.py와 같은 방식으로 스텁을 먼저 설치한다.
+_TESTS_PATH = os.path.dirname(os.path.abspath(__file__))
+if _TESTS_PATH not in sys.path:
+    sys.path.insert(0, _TESTS_PATH)
+
+from test_dds_conversion import ensure_dependency_stubs
+
+ensure_dependency_stubs()
+focus_shine = importlib.import_module("hoi4_gfx_manager.services.focus_shine")
+
+
+GOALS_GFX = """spriteTypes = {
+\tspriteType = {
+\t\tname = "GFX_goal_alpha"
+\t\ttexturefile = "gfx\\interface\\goals\\alpha.dds"
+\t}
+\tspriteType = {
+\t\tname = "GFX_goal_beta"
+\t\ttexturefile = "gfx/interface/goals/beta.dds"
+\t}
+\t# spriteType = { name = "GFX_goal_commented" texturefile = "gfx/commented.dds" }
+}
+"""
+
+GOALS_SHINE_GFX = """spriteTypes = {
+\tSpriteType = {
+\t\tname = "GFX_goal_beta_shine"
+\t\ttexturefile = "gfx/interface/goals/beta.dds"
+\t}
+}
+"""
+
+
+class FocusGFXShineGeneratorTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.goals_path = os.path.join(self.temp_dir.name, "goals.gfx")
+        self.shine_path = os.path.join(self.temp_dir.name, "goals_shine.gfx")
+        with open(self.goals_path, "w", encoding="utf-8") as goals_file:
+            goals_file.write(GOALS_GFX)
+        with open(self.shine_path, "w", encoding="utf-8") as shine_file:
+            shine_file.write(GOALS_SHINE_GFX)
+        self.generator = focus_shine.FocusGFXShineGenerator()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def read_shine(self):
+        with open(self.shine_path, encoding="utf-8") as shine_file:
+            return shine_file.read()
+
+    def test_adds_only_missing_uncommented_entries(self):
+        result = self.generator.process_files(self.goals_path, self.shine_path)
+
+        self.assertEqual(result, {
+            "success": True,
+            "added_count": 1,
+            "missing_shine": ["GFX_goal_alpha"],
+        })
+        content = self.read_shine()
+        self.assertIn('name = "GFX_goal_alpha_shine"', content)
+        self.assertIn('animationmaskfile = "gfx/interface/goals/alpha.dds"', content)
+        self.assertNotIn("GFX_goal_commented", content)
+        self.assertEqual(content.count("{"), content.count("}"))
+        self.assertTrue(content.rstrip().endswith("}"))
+
+    def test_appends_missing_entries_in_goals_file_order(self):
+        with open(self.shine_path, "w", encoding="utf-8") as shine_file:
+            shine_file.write("spriteTypes = {\n}\n")
+
+        result = self.generator.process_files(self.goals_path, self.shine_path)
+
+        self.assertEqual(result["missing_shine"], ["GFX_goal_alpha", "GFX_goal_beta"])
+        content = self.read_shine()
+        self.assertLess(
+            content.index("GFX_goal_alpha_shine"), content.index("GFX_goal_beta_shine")
+        )
+        self.assertTrue(content.endswith("}\n"))
+
+    def test_replaces_shine_file_without_leaving_temp_file(self):
+        self.generator.process_files(self.goals_path, self.shine_path)
+
+        self.assertEqual(sorted(os.listdir(self.temp_dir.name)), ["goals.gfx", "goals_shine.gfx"])
+
+    def test_second_run_is_a_no_op(self):
+        self.generator.process_files(self.goals_path, self.shine_path)
+        first = self.read_shine()
+
+        result = self.generator.process_files(self.goals_path, self.shine_path)
+
+        self.assertEqual(result["added_count"], 0)
+        self.assertEqual(self.read_shine(), first)
+
+    def test_empty_goals_file_adds_nothing(self):
+        open(self.goals_path, "w").close()
+
+        result = self.generator.process_files(self.goals_path, self.shine_path)
+
+        self.assertEqual(result, {"success": True, "added_count": 0, "missing_shine": []})
+        self.assertEqual(self.read_shine(), GOALS_SHINE_GFX)
+
+    def test_reports_missing_file_as_failure(self):
+        result = self.generator.process_files(
+            os.path.join(self.temp_dir.name, "absent.gfx"), self.shine_path
+        )
+
+        self.assertFalse(result["success"])
+        self.assertIn("error", result)
+
+
+if __name__ == "__main__":
+    unittest.main()
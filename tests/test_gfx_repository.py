@@ -0,0 +1,238 @@
+import importlib
+import os
+import sys
+import tempfile
+import unittest
+
+# test_analysis.py와 같은 방식으로 스텁을 먼저 설치한다.
+_TESTS_PATH = os.path.dirname(os.path.abspath(__file__))
+if _TESTS_PATH not in sys.path:
+    sys.path.insert(0, _TESTS_PATH)
+
+from test_dds_conversion import ensure_dependency_stubs
+
+ensure_dependency_stubs()
+gfx_repository = importlib.import_module("hoi4_gfx_manager.services.gfx_repository")
+
+
+SHINE_GFX = """spriteTypes = {
+\tspriteType = {
+\t\tname = "GFX_goal_alpha"
+\t\ttexturefile = "gfx/interface/goals/alpha.dds"
+\t}
+\tSpriteType = {
+\t\tname = "GFX_goal_beta_shine"
+\t\ttexturefile = "gfx/interface/goals/beta.dds"
+\t\tanimation = {
+\t\t\tanimationmaskfile = "gfx/interface/goals/beta.dds"
+\t\t\tanimationrotationoffset = { x = 0.0 y = 0.0 }
+\t\t\tanimationtexturescale = { x = 1.0 y = 1.0 }
+\t\t}
+\t}
+\t# spriteType = { name = "GFX_commented" texturefile = "gfx/commented.dds" }
+}
+"""
+
+
+class GFXRepositoryTestCase(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.mod_folder = self.temp_dir.name
+        self.gfx_path = os.path.join(self.mod_folder, "goals.gfx")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def write_gfx(self, content):
+        with open(self.gfx_path, "w", encoding="utf-8") as gfx_file:
+            gfx_file.write(content)
+
+
+class ParseGFXFileTests(GFXRepositoryTestCase):
+    def test_parses_sprites_with_deeply_nested_blocks(self):
+        self.write_gfx(SHINE_GFX)
+
+        entries = gfx_repository.parse_gfx_file(self.gfx_path, self.mod_folder)
+
+        self.assertEqual(
+            [entry.name for entry in entries],
+            ["GFX_goal_alpha", "GFX_goal_beta_shine"],
+        )
+        self.assertEqual(entries[1].relative_path, "gfx/interface/goals/beta.dds")
+        self.assertEqual(
+            entries[1].texturefile,
+            os.path.join(self.mod_folder, "gfx/interface/goals/beta.dds"),
+        )
+
+    def test_skips_unterminated_sprite_block(self):
+        self.write_gfx(
+            'spriteTypes = {\n'
+            '\tspriteType = { name = "GFX_ok" texturefile = "gfx/ok.dds" }\n'
+            '\tspriteType = { name = "GFX_broken" texturefile = "gfx/broken.dds"\n'
+        )
+
+        entries = gfx_repository.parse_gfx_file(self.gfx_path, self.mod_folder)
+
+        self.assertEqual([entry.name for entry in entries], ["GFX_ok"])
+
+    def test_decodes_bom_and_cp1252_files(self):
+        with open(self.gfx_path, "wb") as gfx_file:
+            gfx_file.write(
+                b'\xef\xbb\xbfspriteType = { name = "GFX_bom" texturefile = "gfx/a.dds" }\n'
+                b'# caf\xe9\n'
+            )
+
+        entries = gfx_repository.parse_gfx_file(self.gfx_path, self.mod_folder)
+
+        self.assertEqual([entry.name for entry in entries], ["GFX_bom"])
+
+    def test_reparses_after_module_write_even_with_same_stamp(self):
+        self.write_gfx('spriteType = { name = "GFX_aaa" texturefile = "gfx/a.dds" }\n')
+        gfx_repository.parse_gfx_file(self.gfx_path, self.mod_folder)
+        stat = os.stat(self.gfx_path)
+
+        gfx_repository._write_gfx_file(
+            self.gfx_path, 'spriteType = { name = "GFX_bbb" texturefile = "gfx/b.dds" }\n'
+        )
+        os.utime(self.gfx_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+        entries = gfx_repository.parse_gfx_file(self.gfx_path, self.mod_folder)
+        self.assertEqual([entry.name for entry in entries], ["GFX_bbb"])
+
+
+class SaveGFXToFileTests(GFXRepositoryTestCase):
+    def test_inserts_inside_sprite_types_block_not_trailing_block(self):
+        self.write_gfx(
+            'spriteTypes = {\n'
+            '\tspriteType = { name = "GFX_a" texturefile = "gfx/a.dds" }\n'
+            '}\n'
+            'objectTypes = {\n'
+            '\tarrowType = { name = "arrow" }\n'
+            '}\n'
+            '# trailing note }\n'
+        )
+
+        gfx_repository.save_gfx_to_file(self.gfx_path, "GFX_b", "gfx\\b.dds")
+
+        with open(self.gfx_path, encoding="utf-8") as gfx_file:
+            content = gfx_file.read()
+        self.assertLess(content.index("GFX_b"), content.index("objectTypes"))
+        self.assertTrue(content.endswith("# trailing note }\n"))
+        entries = gfx_repository.parse_gfx_file(self.gfx_path, self.mod_folder)
+        self.assertEqual([entry.name for entry in entries], ["GFX_a", "GFX_b"])
+        self.assertEqual(entries[1].relative_path, "gfx/b.dds")
+
+    def test_appends_sprite_types_block_when_missing(self):
+        self.write_gfx("")
+
+        gfx_repository.save_gfx_to_file(self.gfx_path, "GFX_new", "gfx/new.dds")
+
+        entries = gfx_repository.parse_gfx_file(self.gfx_path, self.mod_folder)
+        self.assertEqual([entry.name for entry in entries], ["GFX_new"])
+
+
+class RemoveGFXFromFileTests(GFXRepositoryTestCase):
+    def test_removes_whole_sprite_including_nested_blocks(self):
+        self.write_gfx(SHINE_GFX)
+
+        gfx_repository.remove_gfx_from_file(self.gfx_path, "GFX_goal_beta_shine")
+
+        entries = gfx_repository.parse_gfx_file(self.gfx_path, self.mod_folder)
+        self.assertEqual([entry.name for entry in entries], ["GFX_goal_alpha"])
+        with open(self.gfx_path, encoding="utf-8") as gfx_file:
+            content = gfx_file.read()
+        self.assertNotIn("animation", content)
+        self.assertEqual(content.count("{"), content.count("}"))
+
+    def test_does_not_remove_sprites_sharing_a_name_prefix(self):
+        self.write_gfx(
+            'spriteTypes = {\n'
+            '\tspriteType = { name = "GFX_icon" texturefile = "gfx/icon.dds" }\n'
+            '\tspriteType = { name = "GFX_icon_big" texturefile = "gfx/icon_big.dds" }\n'
+            '}\n'
+        )
+
+        gfx_repository.remove_gfx_from_file(self.gfx_path, "GFX_icon")
+
+        entries = gfx_repository.parse_gfx_file(self.gfx_path, self.mod_folder)
+        self.assertEqual([entry.name for entry in entries], ["GFX_icon_big"])
+
+    def test_leaves_file_untouched_when_name_is_absent(self):
+        self.write_gfx(SHINE_GFX)
+        before = os.stat(self.gfx_path).st_mtime_ns
+        os.utime(self.gfx_path, ns=(before - 10**9, before - 10**9))
+
+        gfx_repository.remove_gfx_from_file(self.gfx_path, "GFX_commented")
+        gfx_repository.remove_gfx_from_file(self.gfx_path, "GFX_not_there")
+
+        self.assertEqual(os.stat(self.gfx_path).st_mtime_ns, before - 10**9)
+
+
+class UpdateGFXTexturePathTests(GFXRepositoryTestCase):
+    def test_replaces_only_the_named_sprites_texturefile(self):
+        self.write_gfx(SHINE_GFX)
+
+        gfx_repository.update_gfx_texture_path(
+            self.gfx_path, "GFX_goal_beta_shine", "gfx\\interface\\goals\\gamma.dds"
+        )
+
+        entries = gfx_repository.parse_gfx_file(self.gfx_path, self.mod_folder)
+        self.assertEqual(
+            [entry.relative_path for entry in entries],
+            ["gfx/interface/goals/alpha.dds", "gfx/interface/goals/gamma.dds"],
+        )
+        with open(self.gfx_path, encoding="utf-8") as gfx_file:
+            content = gfx_file.read()
+        self.assertIn('animationmaskfile = "gfx/interface/goals/beta.dds"', content)
+
+    def test_edits_cp1252_file_and_keeps_its_bytes(self):
+        with open(self.gfx_path, "wb") as gfx_file:
+            gfx_file.write(
+                b'spriteTypes = {\n'
+                b'\t# caf\xe9 \x81\n'
+                b'\tspriteType = { name = "GFX_old" texturefile = "gfx/a.dds" }\n'
+                b'}\n'
+            )
+
+        gfx_repository.update_gfx_texture_path(self.gfx_path, "GFX_old", "gfx/b.dds")
+        gfx_repository.save_gfx_to_file(self.gfx_path, "GFX_new", "gfx/c.dds")
+
+        with open(self.gfx_path, "rb") as gfx_file:
+            raw = gfx_file.read()
+        self.assertIn(b"# caf\xe9 \x81", raw)
+        entries = gfx_repository.parse_gfx_file(self.gfx_path, self.mod_folder)
+        self.assertEqual(
+            [(entry.name, entry.relative_path) for entry in entries],
+            [("GFX_old", "gfx/b.dds"), ("GFX_new", "gfx/c.dds")],
+        )
+
+
+class ScanModFolderTests(GFXRepositoryTestCase):
+    def test_collects_duplicates_across_files_in_scan_order(self):
+        for file_name in ("a.gfx", "b.gfx"):
+            with open(os.path.join(self.mod_folder, file_name), "w", encoding="utf-8") as gfx_file:
+                gfx_file.write('spriteType = { name = "GFX_same" texturefile = "gfx/x.dds" }\n')
+
+        gfx_data, duplicates, gfx_files = gfx_repository.scan_mod_folder(self.mod_folder)
+
+        self.assertEqual(duplicates["GFX_same"], [str(path) for path in gfx_files])
+        self.assertEqual(gfx_data["GFX_same"]["status"], "duplicate")
+        self.assertEqual(gfx_data["GFX_same"]["file_source"], str(gfx_files[-1]))
+
+    def test_scan_drops_cache_entries_of_files_outside_the_scan(self):
+        other_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(other_dir.cleanup)
+        other_gfx = os.path.join(other_dir.name, "old.gfx")
+        with open(other_gfx, "w", encoding="utf-8") as gfx_file:
+            gfx_file.write('spriteType = { name = "GFX_old" texturefile = "gfx/o.dds" }\n')
+        gfx_repository.parse_gfx_file(other_gfx, other_dir.name)
+        self.write_gfx('spriteType = { name = "GFX_now" texturefile = "gfx/n.dds" }\n')
+
+        gfx_repository.scan_mod_folder(self.mod_folder)
+
+        self.assertNotIn(os.path.abspath(other_gfx), gfx_repository._PARSE_CACHE)
+        self.assertIn(os.path.abspath(self.gfx_path), gfx_repository._PARSE_CACHE)
+
+
+if __name__ == "__main__":
+    unittest.main()